@@ -0,0 +1,218 @@
+"""
+Benchmarks du preprocessing, de l'entrainement et du scoring
+
+Genere des jeux synthetiques au schema de StudentPerformanceFactors.csv
+(20 colonnes), mesure la duree et le pic memoire de chaque etape, et
+ecrit les resultats en JSON pour comparer les commits entre eux.
+
+Exemples :
+    python benchmarks/bench_pipeline.py --rows 10000 1000000 10000000
+    python benchmarks/bench_pipeline.py --rows 10000 --compare benchmarks/results/ancien.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+from sklearn.linear_model import Ridge
+
+from schema import CATEGORY_LEVELS, TARGET
+from preprocessing import (Preprocessor, load_data, handle_outliers, preprocess_pipeline,
+                           preprocess_chunks)
+from ridge import stats_from_chunks
+from score import score_file
+
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+DATA_DIR = os.path.join(ROOT_DIR, 'data', 'synthetic')
+GENERATION_CHUNK = 1_000_000
+
+# Ordre des colonnes de StudentPerformanceFactors.csv
+COLUMNS = [
+    'Hours_Studied', 'Attendance', 'Parental_Involvement', 'Access_to_Resources',
+    'Extracurricular_Activities', 'Sleep_Hours', 'Previous_Scores', 'Motivation_Level',
+    'Internet_Access', 'Tutoring_Sessions', 'Family_Income', 'Teacher_Quality',
+    'School_Type', 'Peer_Influence', 'Physical_Activity', 'Learning_Disabilities',
+    'Parental_Education_Level', 'Distance_from_Home', 'Gender', 'Exam_Score'
+]
+
+# Colonnes avec ~1 % de valeurs manquantes, comme dans le jeu reel
+MISSING_COLUMNS = ['Teacher_Quality', 'Parental_Education_Level', 'Distance_from_Home']
+
+
+def make_synthetic(n_rows, seed=0):
+    """Jeu synthetique de n_rows etudiants au schema du CSV reel"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Hours_Studied': rng.integers(1, 45, n_rows),
+        'Attendance': rng.integers(60, 101, n_rows),
+        'Sleep_Hours': rng.integers(4, 11, n_rows),
+        'Previous_Scores': rng.integers(50, 101, n_rows),
+        'Tutoring_Sessions': rng.poisson(1.5, n_rows).clip(0, 8),
+        'Physical_Activity': rng.integers(0, 7, n_rows)
+    })
+    for col, levels in CATEGORY_LEVELS.items():
+        values = np.array(levels, dtype=object)[rng.integers(0, len(levels), n_rows)]
+        if col in MISSING_COLUMNS:
+            values[rng.random(n_rows) < 0.01] = None
+        df[col] = values
+    df[TARGET] = (40 + 0.3 * df['Attendance'] + 0.3 * df['Hours_Studied']
+                  + rng.normal(0, 2, n_rows)).round().astype(int).clip(55, 101)
+    return df[COLUMNS]
+
+
+def synthetic_csv(n_rows, seed=0):
+    """Chemin d'un CSV synthetique, genere par blocs s'il n'existe pas encore"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f'students_{n_rows}_{seed}.csv')
+    if not os.path.exists(path):
+        tmp_path = path + '.tmp'
+        for i, start in enumerate(range(0, n_rows, GENERATION_CHUNK)):
+            size = min(GENERATION_CHUNK, n_rows - start)
+            make_synthetic(size, seed + i).to_csv(tmp_path, mode='a' if i else 'w',
+                                                  header=(i == 0), index=False)
+        os.replace(tmp_path, path)
+    return path
+
+
+def measure(name, rows, function, trace_memory=True):
+    """Execute function() et retourne (resultat, mesure de l'etape)"""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+    return result, {
+        'stage': name,
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds else None,
+        'peak_mb': peak / 1024 ** 2 if peak is not None else None
+    }
+
+
+def run_benchmarks(n_rows, trace_memory=True, chunksize=100_000):
+    """Mesure chaque etape sur un jeu synthetique de n_rows lignes"""
+    path = synthetic_csv(n_rows)
+    results = []
+
+    def step(name, function):
+        result, record = measure(name, n_rows, function, trace_memory)
+        results.append(record)
+        print(f"  {name:<24} {record['seconds']:8.3f} s"
+              + (f"  {record['peak_mb']:9.1f} Mo" if trace_memory else ''))
+        return result
+
+    raw = step('load_data', lambda: load_data(path))
+    step('load_data_typed', lambda: load_data(path, typed=True))
+    step('handle_outliers', lambda: handle_outliers(raw))
+    df = step('preprocess_pipeline', lambda: preprocess_pipeline(path))
+    step('preprocess_chunks', lambda: sum(len(c) for c in preprocess_chunks(path, chunksize)))
+    preprocessor = Preprocessor().fit(raw)
+    del raw
+
+    X = df.drop(columns=TARGET)
+    y = df[TARGET]
+    model = step('fit_ridge', lambda: Ridge(alpha=10).fit(X, y))
+    step('fit_ridge_stats', lambda: stats_from_chunks(preprocess_chunks(path, chunksize)).solve(10))
+    # Scoring de bout en bout : lecture du CSV brut, encodage, prediction, ecriture
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, 'predictions.csv')
+        step('score_file', lambda: score_file(path, output, model, preprocessor,
+                                              batch_size=chunksize))
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(results, path=None):
+    """Ecrit les resultats et le contexte d'execution en JSON"""
+    commit = _git_commit()
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f'{stamp}-{commit or "local"}.json')
+    payload = {
+        'timestamp': stamp,
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'results': results
+    }
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def compare_results(old_path, new_path, threshold=1.2):
+    """Compare deux fichiers de resultats ; retourne les etapes ralenties au-dela du seuil"""
+    with open(old_path) as f:
+        old = {(r['stage'], r['rows']): r for r in json.load(f)['results']}
+    with open(new_path) as f:
+        new = json.load(f)['results']
+
+    regressions = []
+    for record in new:
+        before = old.get((record['stage'], record['rows']))
+        if before is None or not before['seconds']:
+            continue
+        ratio = record['seconds'] / before['seconds']
+        flag = '  <-- regression' if ratio > threshold else ''
+        print(f"  {record['stage']:<24} {record['rows']:>10}  x{ratio:5.2f}{flag}")
+        if ratio > threshold:
+            regressions.append((record['stage'], record['rows'], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline Student Performance")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000])
+    parser.add_argument('--output', default=None, help="Fichier JSON de resultats")
+    parser.add_argument('--compare', default=None, help="Resultats precedents a comparer")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="Ratio de duree signale comme regression")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="Ne pas mesurer le pic memoire (tracemalloc ralentit)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for n_rows in args.rows:
+        print(f"{n_rows} lignes :")
+        results += run_benchmarks(n_rows, trace_memory=not args.no_memory)
+
+    path = write_results(results, args.output)
+    print(f"Resultats : {path}")
+
+    if args.compare:
+        print(f"Comparaison avec {args.compare} :")
+        if compare_results(args.compare, path, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
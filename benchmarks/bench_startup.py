@@ -0,0 +1,112 @@
+"""
+Benchmark du demarrage a froid : imports et scoring d'un etudiant
+
+Chaque mesure lance un nouveau processus Python : temps d'import de
+chaque module de src/ (mesure dans le processus), puis duree totale,
+interpreteur compris, du scoring d'un etudiant par fastscore.py et par
+score.py. Les resultats s'ecrivent au meme format JSON que
+bench_pipeline.py (comparables avec --compare).
+
+Exemple :
+    python benchmarks/bench_startup.py --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_pipeline import ROOT_DIR, write_results, compare_results
+
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+DEFAULT_MODEL = os.path.join(ROOT_DIR, 'models', 'final_model.splm')
+MODULES = ['schema', 'artifact', 'fastscore', 'preprocessing', 'score']
+# Objectif : un etudiant score dans un processus neuf en moins d'une seconde
+TARGET_SECONDS = 1.0
+
+STUDENT = {
+    'Hours_Studied': 23, 'Attendance': 84, 'Parental_Involvement': 'Low',
+    'Access_to_Resources': 'High', 'Extracurricular_Activities': 'No', 'Sleep_Hours': 7,
+    'Previous_Scores': 73, 'Motivation_Level': 'Low', 'Internet_Access': 'Yes',
+    'Tutoring_Sessions': 0, 'Family_Income': 'Low', 'Teacher_Quality': 'Medium',
+    'School_Type': 'Public', 'Peer_Influence': 'Positive', 'Physical_Activity': 3,
+    'Learning_Disabilities': 'No', 'Parental_Education_Level': 'High School',
+    'Distance_from_Home': 'Near', 'Gender': 'Male'
+}
+
+
+def import_seconds(module):
+    """Duree d'import d'un module dans un processus neuf"""
+    code = (f"import sys, time; sys.path.insert(0, {SRC_DIR!r}); "
+            f"t = time.perf_counter(); import {module}; print(time.perf_counter() - t)")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                            text=True, check=True).stdout
+    return float(output)
+
+
+def process_seconds(command):
+    """Duree totale d'une commande, demarrage de l'interpreteur compris"""
+    start = time.perf_counter()
+    subprocess.run(command, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def run_benchmarks(model_path=DEFAULT_MODEL, repeat=5):
+    """Mediane de chaque mesure sur repeat processus"""
+    results = []
+
+    def record(name, function):
+        seconds = statistics.median(function() for _ in range(repeat))
+        results.append({'stage': name, 'rows': 1, 'seconds': seconds,
+                        'rows_per_second': 1 / seconds, 'peak_mb': None})
+        print(f"  {name:<28} {seconds * 1000:8.1f} ms")
+        return seconds
+
+    record('python', lambda: process_seconds([sys.executable, '-c', 'pass']))
+    for module in MODULES:
+        record(f'import_{module}', lambda: import_seconds(module))
+
+    fast = record('fastscore_one', lambda: process_seconds(
+        [sys.executable, os.path.join(SRC_DIR, 'fastscore.py'), model_path,
+         '--json', json.dumps(STUDENT)]))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, 'student.csv')
+        with open(input_path, 'w') as f:
+            f.write(','.join(STUDENT) + '\n' + ','.join(map(str, STUDENT.values())) + '\n')
+        record('score_one', lambda: process_seconds(
+            [sys.executable, os.path.join(SRC_DIR, 'score.py'), input_path,
+             os.path.join(tmp_dir, 'predictions.csv'), '--model', model_path]))
+
+    status = 'atteint' if fast < TARGET_SECONDS else 'NON atteint'
+    print(f"fastscore : {fast:.3f} s pour un etudiant, objectif < {TARGET_SECONDS} s {status}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du demarrage a froid")
+    parser.add_argument('--model', default=DEFAULT_MODEL, help="Modele .splm")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=None, help="Fichier JSON de resultats")
+    parser.add_argument('--compare', default=None, help="Resultats precedents a comparer")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="Ratio de duree signale comme regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.model, args.repeat)
+    path = write_results(results, args.output)
+    print(f"Resultats : {path}")
+
+    if args.compare:
+        print(f"Comparaison avec {args.compare} :")
+        if compare_results(args.compare, path, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
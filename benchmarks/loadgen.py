@@ -0,0 +1,108 @@
+"""
+Generateur de charge pour le service de prediction (src/server.py)
+
+Envoie des requetes unitaires concurrentes avec des etudiants tires du
+CSV, puis affiche les latences cote client et les compteurs du serveur.
+
+Exemple :
+    python src/server.py --port 8000 &
+    python benchmarks/loadgen.py --url http://127.0.0.1:8000 --requests 5000 --concurrency 32
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+DEFAULT_DATA = os.path.join(ROOT_DIR, 'data', 'raw', 'StudentPerformanceFactors.csv')
+
+
+def load_records(filepath, n=1000, seed=42):
+    """Tire n etudiants du CSV sous forme de dicts JSON-serialisables"""
+    df = pd.read_csv(filepath).drop(columns='Exam_Score', errors='ignore')
+    df = df.sample(n=min(n, len(df)), random_state=seed)
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict('records')
+
+
+def _post(url, record):
+    request = urllib.request.Request(url + '/predict', data=json.dumps(record).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())['prediction']
+
+
+def run_load(url, records, n_requests=1000, concurrency=16):
+    """Envoie n_requests requetes avec concurrency threads ; retourne les statistiques"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    counter = iter(range(n_requests))
+
+    def worker():
+        local = []
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                _post(url, records[i % len(records)])
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    p50, p99 = np.percentile(latencies_ms, [50, 99]) if len(latencies) else (0.0, 0.0)
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'seconds': seconds,
+        'throughput_rps': len(latencies) / seconds,
+        'latency_p50_ms': float(p50),
+        'latency_p99_ms': float(p99)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Charge sur le service de prediction")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--data', default=DEFAULT_DATA)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args(argv)
+
+    records = load_records(args.data)
+    client = run_load(args.url, records, args.requests, args.concurrency)
+    with urllib.request.urlopen(args.url + '/metrics') as response:
+        server = json.loads(response.read())
+
+    print("Client :")
+    print(f"  requetes : {client['requests']} ({client['errors']} erreurs)")
+    print(f"  debit    : {client['throughput_rps']:.0f} req/s")
+    print(f"  p50      : {client['latency_p50_ms']:.2f} ms")
+    print(f"  p99      : {client['latency_p99_ms']:.2f} ms")
+    print("Serveur :")
+    print(f"  taille moyenne des lots : {server['mean_batch_size']:.1f}")
+    print(f"  p50 / p99 (file + predict) : "
+          f"{server['latency_p50_ms']:.2f} / {server['latency_p99_ms']:.2f} ms")
+    return client, server
+
+
+if __name__ == "__main__":
+    main()
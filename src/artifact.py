@@ -0,0 +1,148 @@
+"""
+Format compact des modeles lineaires (.splm), a cote de final_model.pkl
+
+Le fichier contient, sans aucun objet pickle :
+    - 4 octets    : b'SPLM'
+    - uint32 LE   : version du format
+    - uint32 LE   : taille de l'en-tete JSON
+    - en-tete JSON : noms et ordre des features, intercept, etat du
+                     Preprocessor (Preprocessor.to_dict)
+    - padding jusqu'a un multiple de 64 octets
+    - coefficients float64 little-endian
+
+Les coefficients sont ouverts en memory-map : tous les processus qui
+chargent le meme fichier partagent les memes pages. Le scoring est un
+produit scalaire NumPy, sans importer scikit-learn. NumPy n'est importe
+qu'a l'usage : read_header suffit a fastscore.py, sans aucune dependance.
+
+Exemple :
+    python src/artifact.py models/final_model.pkl models/final_model.splm
+"""
+
+import json
+import os
+import struct
+
+from schema import TARGET, learned_state
+
+MAGIC = b'SPLM'
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct('<4sII')
+_ALIGNMENT = 64
+
+
+def _data_offset(header_size):
+    size = _PREFIX.size + header_size
+    return size + (-size) % _ALIGNMENT
+
+
+def export_linear(model, preprocessor, path):
+    """Ecrit un modele lineaire entraine et son preprocessing au format .splm"""
+    import numpy as np
+    coef = np.asarray(model.coef_, dtype='<f8').ravel()
+    intercept = float(np.ravel(model.intercept_)[0])
+    feature_names = list(getattr(model, 'feature_names_in_', preprocessor.feature_columns_))
+    if feature_names != preprocessor.feature_columns_:
+        raise ValueError("Les features du modele ne correspondent pas au preprocessing")
+    if len(coef) != len(feature_names):
+        raise ValueError("Nombre de coefficients different du nombre de features")
+
+    header = json.dumps({
+        'model': type(model).__name__,
+        'feature_names': feature_names,
+        'intercept': intercept,
+        'preprocessor': preprocessor.to_dict()
+    }).encode()
+    offset = _data_offset(len(header))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        f.write(b'\0' * (offset - _PREFIX.size - len(header)))
+        f.write(coef.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_header(path):
+    """En-tete JSON et position des coefficients d'un fichier .splm"""
+    with open(path, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError(f"{path} : fichier .splm tronque")
+        magic, version, header_size = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError(f"{path} : ce n'est pas un fichier .splm")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path} : version {version} non supportee "
+                             f"(attendue {FORMAT_VERSION})")
+        header = json.loads(f.read(header_size))
+    return header, _data_offset(header_size)
+
+
+class LinearArtifact:
+    """Modele lineaire charge depuis un fichier .splm"""
+
+    def __init__(self, path, header, coef):
+        self.path = path
+        self.header = header
+        self.feature_names = header['feature_names']
+        self.intercept = header['intercept']
+        self.coef = coef
+
+    def predict(self, X):
+        """Predictions pour une matrice (n, n_features) dans l'ordre feature_names"""
+        import numpy as np
+        return np.asarray(X) @ self.coef + self.intercept
+
+    def preprocessor(self):
+        """Preprocessor reconstruit depuis l'etat stocke (importe pandas)"""
+        from preprocessing import Preprocessor
+        return Preprocessor.from_dict(self.header['preprocessor'])
+
+    def __reduce__(self):
+        # Un worker rouvre le fichier en memory-map plutot que de recevoir une copie
+        return load_linear, (self.path, self.feature_names)
+
+
+def load_linear(path, expected_features=None):
+    """Charge un fichier .splm, coefficients en memory-map
+
+    Leve ValueError si le fichier est invalide, si ses features ne
+    correspondent pas a son propre etat de preprocessing, ou a
+    expected_features quand cette liste est fournie.
+    """
+    header, offset = read_header(path)
+    feature_names = header['feature_names']
+
+    state = header['preprocessor']
+    _, _, columns = learned_state(state['input_columns'], state['counts'])
+    if [col for col in columns if col != TARGET] != feature_names:
+        raise ValueError(f"{path} : schema des features incoherent avec le preprocessing")
+    if expected_features is not None and list(expected_features) != feature_names:
+        raise ValueError(f"{path} : schema des features different de celui attendu")
+
+    import numpy as np
+    coef = np.memmap(path, dtype='<f8', mode='r', offset=offset, shape=(len(feature_names),))
+    return LinearArtifact(path, header, coef)
+
+
+def main(argv=None):
+    import argparse
+    import joblib
+    from score import add_preprocessor_arguments, load_preprocessor
+
+    parser = argparse.ArgumentParser(description="Export d'un modele lineaire au format .splm")
+    parser.add_argument('model', help="Modele joblib (ex. models/final_model.pkl)")
+    parser.add_argument('output', help="Fichier .splm a ecrire")
+    add_preprocessor_arguments(parser)
+    args = parser.parse_args(argv)
+
+    model = joblib.load(args.model)
+    preprocessor = load_preprocessor(model, args.preprocessor, args.train_data)
+    export_linear(model, preprocessor, args.output)
+    print(f"Modele exporte : {args.output} ({os.path.getsize(args.output)} octets)")
+
+
+if __name__ == "__main__":
+    main()
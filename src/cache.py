@@ -0,0 +1,109 @@
+"""
+Cache disque des matrices de features preprocessees
+
+Cle = hash du contenu du CSV + version du code de preprocessing : le
+cache est invalide automatiquement des que les donnees ou le pipeline
+changent. La matrice est stockee en .npy et rechargee en memory-map,
+sans reparser le CSV ni reencoder. Les entrees les moins recemment
+utilisees sont supprimees au-dela de max_bytes.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import load_data, Preprocessor
+from encoding import encode
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'cache')
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# Modules dont le code determine le contenu de la matrice encodee
+PIPELINE_MODULES = ['schema.py', 'preprocessing.py', 'encoding.py']
+
+_BLOCK_SIZE = 1024 ** 2
+
+
+def file_hash(filepath):
+    """Hash SHA-256 du contenu d'un fichier, lu par blocs"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def pipeline_version():
+    """Hash du code source du pipeline de preprocessing"""
+    digest = hashlib.sha256()
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in PIPELINE_MODULES:
+        with open(os.path.join(src_dir, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def cache_key(filepath):
+    """Cle de cache d'un fichier CSV pour la version courante du pipeline"""
+    return f"{file_hash(filepath)[:32]}-{pipeline_version()[:16]}"
+
+
+def _entry_paths(cache_dir, key):
+    return os.path.join(cache_dir, key + '.npy'), os.path.join(cache_dir, key + '.json')
+
+
+def _evict(cache_dir, max_bytes, keep):
+    """Supprime les entrees les moins recemment utilisees au-dela de max_bytes"""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith('.npy'):
+            path = os.path.join(cache_dir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, name[:-4]))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, key in sorted(entries):
+        if total <= max_bytes:
+            break
+        if key == keep:
+            continue
+        for path in _entry_paths(cache_dir, key):
+            if os.path.exists(path):
+                os.remove(path)
+        total -= size
+
+
+def preprocess_cached(filepath, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """Equivalent de preprocess_pipeline avec cache disque
+
+    Retourne un DataFrame float64 (memes valeurs que preprocess_pipeline)
+    adosse a un memory-map en lecture seule sur le fichier .npy du cache.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    key = cache_key(filepath)
+    matrix_path, meta_path = _entry_paths(cache_dir, key)
+
+    if not (os.path.exists(matrix_path) and os.path.exists(meta_path)):
+        df = load_data(filepath)
+        preprocessor = Preprocessor().fit(df)
+        matrix = encode(df, preprocessor)
+
+        # Ecriture atomique : un lecteur ne voit jamais une entree partielle
+        tmp_path = matrix_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, matrix)
+        with open(meta_path, 'w') as f:
+            json.dump({'columns': preprocessor.columns_, 'source': str(filepath)}, f)
+        os.replace(tmp_path, matrix_path)
+        _evict(cache_dir, max_bytes, keep=key)
+    else:
+        # Marque l'entree comme recemment utilisee pour l'eviction LRU
+        os.utime(matrix_path)
+
+    with open(meta_path) as f:
+        columns = json.load(f)['columns']
+    matrix = np.load(matrix_path, mmap_mode='r')
+    return pd.DataFrame(matrix, columns=columns, copy=False)
@@ -0,0 +1,155 @@
+"""
+Comparaison de modeles en parallele avec cache
+
+Remplace la boucle `for name, model in models.items()` de
+02_Modeling.ipynb : les modeles candidats sont entraines dans un pool
+de processus qui partagent une seule copie memory-mappee de X_train /
+X_test (fichiers .npy) au lieu d'en recevoir chacun une copie picklee.
+Les modeles entraines et leurs metriques sont mis en cache, indexes par
+le hash des donnees et les hyperparametres.
+"""
+
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.tree import DecisionTreeRegressor
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'cache', 'models')
+
+# Colonnes de models/model_metrics.csv
+METRIC_COLUMNS = ['train_rmse', 'train_mae', 'train_r2', 'test_rmse', 'test_mae', 'test_r2']
+TIMING_COLUMNS = ['fit_seconds', 'predict_seconds']
+
+
+def default_models(random_state=42):
+    """Modeles candidats du notebook de modelisation"""
+    return {
+        'Linear Regression': LinearRegression(),
+        'Ridge Regression': Ridge(random_state=random_state),
+        'Decision Tree': DecisionTreeRegressor(random_state=random_state),
+        'Random Forest': RandomForestRegressor(n_estimators=100, random_state=random_state),
+        'Gradient Boosting': GradientBoostingRegressor(n_estimators=100, random_state=random_state)
+    }
+
+
+def regression_metrics(y_true, y_pred):
+    """RMSE, MAE et R²"""
+    errors = np.asarray(y_true, dtype=np.float64) - y_pred
+    sse = errors @ errors
+    sst = ((y_true - np.mean(y_true)) ** 2).sum()
+    return np.sqrt(sse / len(errors)), np.abs(errors).mean(), 1 - sse / sst
+
+
+def data_hash(*arrays):
+    """Hash SHA-256 du contenu des tableaux"""
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype=np.float64)
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def model_key(name, model, data_key):
+    """Cle de cache d'un modele : donnees + classe + hyperparametres"""
+    params = sorted((k, repr(v)) for k, v in model.get_params().items())
+    text = f"{data_key}|{name}|{type(model).__name__}|{params}"
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _share(data_dir, columns, **arrays):
+    """Ecrit chaque tableau une fois en .npy ; les workers les ouvrent en memory-map"""
+    os.makedirs(data_dir, exist_ok=True)
+    paths = {}
+    for name, array in arrays.items():
+        path = os.path.join(data_dir, name + '.npy')
+        if not os.path.exists(path):
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.asarray(array, dtype=np.float64))
+            os.replace(tmp_path, path)
+        paths[name] = path
+    paths['columns'] = columns
+    return paths
+
+
+def _load_shared(paths, name):
+    array = np.load(paths[name], mmap_mode='r')
+    if array.ndim == 2 and paths['columns'] is not None:
+        return pd.DataFrame(array, columns=paths['columns'], copy=False)
+    return array
+
+
+def _fit_candidate(name, model, paths, cache_path):
+    X_train, X_test = _load_shared(paths, 'X_train'), _load_shared(paths, 'X_test')
+    y_train, y_test = _load_shared(paths, 'y_train'), _load_shared(paths, 'y_test')
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred_train = model.predict(X_train)
+    y_pred_test = model.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+
+    metrics = dict(zip(METRIC_COLUMNS, regression_metrics(y_train, y_pred_train)
+                       + regression_metrics(y_test, y_pred_test)))
+    metrics.update(fit_seconds=fit_seconds, predict_seconds=predict_seconds)
+
+    tmp_path = cache_path + '.tmp'
+    joblib.dump({'model': model, 'metrics': metrics}, tmp_path)
+    os.replace(tmp_path, cache_path)
+    return model, metrics
+
+
+def compare_models(X_train, X_test, y_train, y_test, models=None, n_jobs=None,
+                   cache_dir=DEFAULT_CACHE_DIR):
+    """Entraine et evalue chaque modele ; retourne (results_df, fitted_models)
+
+    results_df est indexe par nom de modele avec les colonnes de
+    model_metrics.csv, les durees d'entrainement et de prediction, et
+    `cached` (True si le modele vient du cache).
+    """
+    models = default_models() if models is None else models
+    columns = list(X_train.columns) if hasattr(X_train, 'columns') else None
+    data_key = data_hash(X_train, X_test, y_train, y_test)
+    paths = _share(os.path.join(cache_dir, 'data', data_key[:32]), columns,
+                   X_train=X_train, X_test=X_test, y_train=y_train, y_test=y_test)
+
+    fitted, rows, pending = {}, {}, {}
+    for name, model in models.items():
+        cache_path = os.path.join(cache_dir, model_key(name, model, data_key) + '.joblib')
+        if os.path.exists(cache_path):
+            entry = joblib.load(cache_path)
+            fitted[name], rows[name] = entry['model'], dict(entry['metrics'], cached=True)
+        else:
+            pending[name] = (model, cache_path)
+
+    names = list(pending)
+    args = ([pending[name][0] for name in names], [paths] * len(names),
+            [pending[name][1] for name in names])
+    if n_jobs == 1 or len(names) <= 1:
+        outputs = list(map(_fit_candidate, names, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            outputs = list(executor.map(_fit_candidate, names, *args))
+    for name, (model, metrics) in zip(names, outputs):
+        fitted[name], rows[name] = model, dict(metrics, cached=False)
+
+    results = pd.DataFrame.from_dict({name: rows[name] for name in models}, orient='index')
+    results.index.name = 'model_name'
+    return results[METRIC_COLUMNS + TIMING_COLUMNS + ['cached']], fitted
+
+
+def save_metrics(results, path):
+    """Ecrit les resultats au format de models/model_metrics.csv (+ durees)"""
+    results[METRIC_COLUMNS + TIMING_COLUMNS].reset_index().to_csv(path, index=False)
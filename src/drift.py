@@ -0,0 +1,278 @@
+"""
+Surveillance de la derive des lots scores par rapport aux donnees d'entrainement
+
+La reference (DriftReference) stocke, pour chaque colonne d'entree du
+schema, un histogramme compact : deciles d'entrainement pour les colonnes
+numeriques, frequence de chaque modalite pour les colonnes categorielles
+(les colonnes encodees par le preprocessing en sont une bijection), plus
+un seau "valeur vide" et, pour les categories, un seau "modalite
+inconnue". Les residus du modele (Exam_Score - prediction) ont leur
+propre histogramme. La reference s'ecrit en JSON.
+
+DriftMonitor ajoute chaque lot aux comptes courants (memoire constante :
+quelques entiers par colonne) et recalcule le PSI et, pour les colonnes
+numeriques, le KS sur les seaux. Les colonnes qui depassent les seuils
+sont signalees au callback des qu'elles passent en alerte.
+
+Exemple :
+    python src/drift.py data/raw/StudentPerformanceFactors.csv models/drift_reference.json
+    python src/score.py etudiants.csv predictions.csv --drift-reference models/drift_reference.json
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from schema import TARGET, NUMERIC_RANGES, CATEGORY_LEVELS
+
+REFERENCE_VERSION = 1
+RESIDUAL = '_residual'
+DEFAULT_BINS = 10
+# Proportion minimale d'un seau pour que le PSI reste fini
+_EPSILON = 1e-4
+
+OK, WATCH, ALERT = 'ok', 'surveillance', 'derive'
+
+
+class Histogram:
+    """Comptes par seau d'une colonne numerique (edges) ou categorielle (levels)
+
+    Seaux numeriques : len(edges) + 1 intervalles, puis les valeurs vides.
+    Seaux categoriels : une par modalite, puis inconnue, puis vide.
+    """
+
+    def __init__(self, edges=None, levels=None):
+        self.edges = None if edges is None else np.asarray(edges, dtype=np.float64)
+        self.levels = None if levels is None else list(levels)
+        self._index = None if levels is None else {level: i for i, level in enumerate(self.levels)}
+
+    @property
+    def numeric(self):
+        return self.edges is not None
+
+    @property
+    def n_buckets(self):
+        return len(self.edges) + 2 if self.numeric else len(self.levels) + 2
+
+    def counts(self, values):
+        """Comptes par seau d'une Series ou d'un tableau"""
+        if self.numeric:
+            array = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(np.float64)
+            missing = np.isnan(array)
+            buckets = np.searchsorted(self.edges, array[~missing], side='right')
+            counts = np.bincount(buckets, minlength=len(self.edges) + 1)
+            return np.append(counts, missing.sum())
+
+        # Comptes par valeur distincte, puis report sur les modalites
+        codes, uniques = pd.factorize(pd.Series(values))
+        per_unique = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        lookup = np.array([self._index.get(value, len(self.levels)) for value in uniques],
+                          dtype=np.intp)
+        counts = np.bincount(lookup, weights=per_unique, minlength=len(self.levels) + 1)
+        return np.append(counts.astype(np.int64), (codes < 0).sum())
+
+    def to_dict(self):
+        if self.numeric:
+            return {'edges': self.edges.tolist()}
+        return {'levels': self.levels}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(edges=state.get('edges'), levels=state.get('levels'))
+
+    @classmethod
+    def quantiles(cls, values, n_bins=DEFAULT_BINS):
+        """Histogramme numerique dont les seaux sont les quantiles de values"""
+        array = pd.to_numeric(pd.Series(values), errors='coerce').dropna().to_numpy(np.float64)
+        if len(array) == 0:
+            return cls(edges=[])
+        edges = np.quantile(array, np.linspace(0, 1, n_bins + 1)[1:-1])
+        return cls(edges=np.unique(edges))
+
+
+def psi(expected, actual):
+    """Population Stability Index entre deux vecteurs de comptes"""
+    expected = np.clip(expected / max(expected.sum(), 1), _EPSILON, None)
+    actual = np.clip(actual / max(actual.sum(), 1), _EPSILON, None)
+    return float(((actual - expected) * np.log(actual / expected)).sum())
+
+
+def ks(expected, actual):
+    """Statistique KS sur des seaux ordonnes (hors seau des valeurs vides)"""
+    expected, actual = expected[:-1], actual[:-1]
+    if expected.sum() == 0 or actual.sum() == 0:
+        return np.nan
+    return float(np.abs(np.cumsum(expected) / expected.sum()
+                        - np.cumsum(actual) / actual.sum()).max())
+
+
+class DriftReference:
+    """Histogrammes et comptes de reference des donnees d'entrainement"""
+
+    def __init__(self, histograms=None, counts=None):
+        self.histograms = {} if histograms is None else histograms
+        self.counts = {} if counts is None else counts
+
+    @classmethod
+    def fit(cls, chunks, predict=None, n_bins=DEFAULT_BINS):
+        """Reference apprise sur des blocs bruts d'entrainement
+
+        Les seaux numeriques sont les quantiles du premier bloc (100 000
+        lignes par defaut avec iter_chunks) ; les comptes couvrent tous les
+        blocs. predict(chunk) -> predictions active l'histogramme des residus.
+        """
+        reference = cls()
+        for chunk in chunks:
+            if not reference.histograms:
+                reference._init_histograms(chunk, predict, n_bins)
+            for col, values in reference._columns(chunk, predict):
+                reference.counts[col] += reference.histograms[col].counts(values)
+        return reference
+
+    def _init_histograms(self, chunk, predict, n_bins):
+        for col in NUMERIC_RANGES:
+            if col != TARGET and col in chunk.columns:
+                self.histograms[col] = Histogram.quantiles(chunk[col], n_bins)
+        for col, levels in CATEGORY_LEVELS.items():
+            if col in chunk.columns:
+                self.histograms[col] = Histogram(levels=levels)
+        if predict is not None and TARGET in chunk.columns:
+            residuals = chunk[TARGET].to_numpy(np.float64) - predict(chunk)
+            self.histograms[RESIDUAL] = Histogram.quantiles(residuals, n_bins)
+        self.counts = {col: np.zeros(h.n_buckets, dtype=np.int64)
+                       for col, h in self.histograms.items()}
+
+    def _columns(self, chunk, predict=None, predictions=None):
+        """(colonne, valeurs) surveillees d'un bloc, residus compris si disponibles"""
+        for col in self.histograms:
+            if col in chunk.columns:
+                yield col, chunk[col]
+        if RESIDUAL in self.histograms and TARGET in chunk.columns:
+            if predictions is None and predict is not None:
+                predictions = predict(chunk)
+            if predictions is not None:
+                yield RESIDUAL, chunk[TARGET].to_numpy(np.float64) - predictions
+
+    def to_dict(self):
+        return {
+            'version': REFERENCE_VERSION,
+            'columns': {col: dict(h.to_dict(), counts=self.counts[col].tolist())
+                        for col, h in self.histograms.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        if state.get('version') != REFERENCE_VERSION:
+            raise ValueError(f"Version de reference non supportee : {state.get('version')}")
+        histograms = {col: Histogram.from_dict(s) for col, s in state['columns'].items()}
+        counts = {col: np.asarray(s['counts'], dtype=np.int64)
+                  for col, s in state['columns'].items()}
+        return cls(histograms, counts)
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+class DriftMonitor:
+    """Comptes courants des lots scores et alertes de derive
+
+    Une colonne est en derive si son PSI depasse psi_alert ou si son KS
+    depasse ks_alert, en surveillance si son PSI depasse psi_watch. Aucune
+    alerte n'est levee avant min_rows lignes. callback(record) est appele
+    une fois par colonne lorsqu'elle passe en derive.
+    """
+
+    def __init__(self, reference, psi_watch=0.1, psi_alert=0.2, ks_alert=0.1,
+                 min_rows=1000, callback=None):
+        self.reference = reference
+        self.psi_watch = psi_watch
+        self.psi_alert = psi_alert
+        self.ks_alert = ks_alert
+        self.min_rows = min_rows
+        self.callback = callback
+        self.reset()
+
+    def reset(self):
+        """Repart de comptes vides (nouvelle fenetre de surveillance)"""
+        self.counts = {col: np.zeros_like(counts)
+                       for col, counts in self.reference.counts.items()}
+        self.alerted = set()
+
+    def update(self, chunk, predictions=None):
+        """Ajoute un bloc brut ; les residus sont suivis si Exam_Score est present"""
+        for col, values in self.reference._columns(chunk, predictions=predictions):
+            self.counts[col] += self.reference.histograms[col].counts(values)
+        if self.callback is None:
+            return
+        for record in self._records():
+            if record['status'] == ALERT and record['column'] not in self.alerted:
+                self.alerted.add(record['column'])
+                self.callback(record)
+
+    def _records(self):
+        for col, counts in self.counts.items():
+            rows = int(counts.sum())
+            if rows == 0:
+                continue
+            expected = self.reference.counts[col]
+            record = {'column': col, 'rows': rows, 'psi': psi(expected, counts),
+                      'ks': ks(expected, counts) if self.reference.histograms[col].numeric
+                      else np.nan}
+            if rows < self.min_rows:
+                record['status'] = OK
+            elif record['psi'] > self.psi_alert or record['ks'] > self.ks_alert:
+                record['status'] = ALERT
+            elif record['psi'] > self.psi_watch:
+                record['status'] = WATCH
+            else:
+                record['status'] = OK
+            yield record
+
+    def report(self):
+        """Une ligne par colonne : column, rows, psi, ks, status"""
+        return pd.DataFrame(list(self._records()),
+                            columns=['column', 'rows', 'psi', 'ks', 'status'])
+
+    def alerts(self):
+        report = self.report()
+        return report[report['status'] == ALERT]
+
+
+def main(argv=None):
+    import argparse
+    from preprocessing import iter_chunks
+    from score import DEFAULT_MODEL, load_model, load_preprocessor, predict_batch
+
+    parser = argparse.ArgumentParser(description="Reference de derive des donnees d'entrainement")
+    parser.add_argument('train_data', help="CSV d'entrainement (avec Exam_Score)")
+    parser.add_argument('output', help="Fichier JSON de reference")
+    parser.add_argument('--model', default=DEFAULT_MODEL,
+                        help="Modele pour les residus (joblib ou .splm)")
+    parser.add_argument('--preprocessor', default=None,
+                        help="Preprocessor sauvegarde (defaut : celui du .splm, "
+                             "sinon models/preprocessor.pkl)")
+    parser.add_argument('--no-residuals', action='store_true')
+    parser.add_argument('--bins', type=int, default=DEFAULT_BINS)
+    args = parser.parse_args(argv)
+
+    predict = None
+    if not args.no_residuals:
+        model = load_model(args.model)
+        preprocessor = load_preprocessor(model, args.preprocessor)
+        predict = lambda chunk: predict_batch(model, preprocessor, chunk)
+
+    reference = DriftReference.fit(iter_chunks(args.train_data), predict, args.bins)
+    reference.save(args.output)
+    print(f"Reference de derive : {args.output} ({os.path.getsize(args.output)} octets)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Moteur d'encodage vectorise
+
+Construit la matrice numerique finale (encodage ordinal + one-hot
+drop_first) en une seule allocation : chaque colonne de sortie est
+remplie directement dans un tableau NumPy prealloue a partir des codes
+de categorie, sans les copies successives de map / fillna / get_dummies.
+Les valeurs sont identiques a celles de Preprocessor.transform.
+"""
+
+import numpy as np
+import pandas as pd
+
+from schema import TARGET, ORDINAL_MAPPINGS, ONEHOT_COLUMNS
+
+
+def _codes(series, categories):
+    """Codes de la colonne par rapport a une liste de categories (-1 si absent)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    # Recodage des quelques valeurs distinctes vers l'ordre des categories
+    position = {cat: i for i, cat in enumerate(categories)}
+    remap = np.array([position.get(u, -1) for u in uniques] + [-1], dtype=np.int8)
+    return remap[codes]
+
+
+def _fill_ordinal(out, j, series, mapping, mode):
+    levels = list(mapping)
+    # Derniere case : code -1 (valeur manquante ou modalite inconnue)
+    lookup = np.array([mapping[level] for level in levels] + [np.nan], dtype=out.dtype)
+    codes = _codes(series, levels)
+    out[:, j] = lookup[codes]
+    if mode is not None:
+        # Les valeurs manquantes prennent l'encodage du mode ;
+        # une modalite inconnue reste NaN comme avec Series.map
+        missing = series.isna().to_numpy()
+        out[missing, j] = mapping.get(mode, np.nan)
+
+
+def _fill_onehot(out, j, series, categories):
+    codes = _codes(series, categories)
+    for k in range(1, len(categories)):
+        out[:, j + k - 1] = codes == k
+
+
+def encode(df, preprocessor, as_frame=False, dtype=np.float64):
+    """Encode un DataFrame brut avec l'etat appris d'un Preprocessor
+
+    Retourne un ndarray (n_lignes, n_colonnes) en ordre colonne, ou un
+    DataFrame adosse a ce meme tableau si as_frame=True. Les colonnes
+    suivent preprocessor.columns_ (sans la cible si elle est absente).
+    """
+    preprocessor._check_fitted()
+    has_target = TARGET in df.columns
+    columns = preprocessor._output_columns(has_target)
+    out = np.empty((len(df), len(columns)), dtype=dtype, order='F')
+
+    j = 0
+    for col in preprocessor.input_columns_:
+        if col in ONEHOT_COLUMNS or (col == TARGET and not has_target):
+            continue
+        if col in ORDINAL_MAPPINGS:
+            _fill_ordinal(out, j, df[col], ORDINAL_MAPPINGS[col], preprocessor.modes_.get(col))
+        else:
+            out[:, j] = df[col].to_numpy(dtype=dtype, na_value=np.nan)
+            if col == TARGET:
+                np.minimum(out[:, j], 100, out=out[:, j])
+        j += 1
+
+    for col in ONEHOT_COLUMNS:
+        categories = preprocessor.categories_[col]
+        _fill_onehot(out, j, df[col], categories)
+        j += max(len(categories) - 1, 0)
+
+    if as_frame:
+        return pd.DataFrame(out, index=df.index, columns=columns, copy=False)
+    return out
@@ -0,0 +1,93 @@
+"""
+Scoring d'un etudiant a froid, sans NumPy, pandas ni scikit-learn
+
+Pour les jobs courts qui scorent quelques etudiants, le cout d'import de
+pandas / NumPy / scikit-learn depasse largement celui du calcul. Ce module
+ne depend que de la bibliotheque standard : il lit l'en-tete d'un fichier
+.splm (artifact.read_header), les coefficients avec array, et reproduit
+Preprocessor.transform_one par simples lookups de dictionnaires avant un
+produit scalaire en Python pur.
+
+Exemples :
+    python src/fastscore.py models/final_model.splm --json '{"Hours_Studied": 23, ...}'
+    python src/fastscore.py models/final_model.splm < etudiants.jsonl
+"""
+
+import json
+import math
+import sys
+from array import array
+
+from schema import TARGET, ORDINAL_MAPPINGS, ONEHOT_COLUMNS, learned_state
+from artifact import read_header
+
+
+class FastModel:
+    """Modele lineaire .splm et son preprocessing, en Python pur"""
+
+    def __init__(self, path):
+        header, offset = read_header(path)
+        self.path = path
+        self.feature_names = header['feature_names']
+        self.intercept = header['intercept']
+
+        self.coef = array('d')
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            self.coef.fromfile(f, len(self.feature_names))
+        if sys.byteorder == 'big':
+            self.coef.byteswap()
+
+        state = header['preprocessor']
+        modes, categories, _ = learned_state(state['input_columns'], state['counts'])
+        # (colonne, mode, table ordinale, coefficient) des colonnes encodees une a une
+        weights = dict(zip(self.feature_names, self.coef))
+        self._columns = [(col, modes.get(col), ORDINAL_MAPPINGS.get(col), weights[col])
+                         for col in state['input_columns']
+                         if col != TARGET and col not in ONEHOT_COLUMNS]
+        # (colonne, {modalite: coefficient}) : une modalite absente vaut 0
+        self._onehot = [(col, {cat: weights[f'{col}_{cat}'] for cat in categories[col][1:]})
+                        for col in ONEHOT_COLUMNS]
+
+    def predict_one(self, record):
+        """Prediction pour un etudiant (dict colonne -> valeur brute)
+
+        Memes regles que Preprocessor.transform_one : valeur manquante
+        remplacee par le mode appris, modalite ordinale inconnue -> nan.
+        """
+        total = self.intercept
+        for col, mode, mapping, weight in self._columns:
+            value = record.get(col)
+            if mode is not None and (value is None or value != value):
+                value = mode
+            if mapping is not None:
+                value = mapping.get(value, math.nan)
+            elif value is None:
+                value = math.nan
+            total += weight * value
+        for col, weights in self._onehot:
+            total += weights.get(record.get(col), 0.0)
+        return total
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scoring rapide d'etudiants (.splm)")
+    parser.add_argument('model', help="Modele lineaire .splm")
+    parser.add_argument('--json', default=None,
+                        help="Un etudiant en JSON (sinon un JSON par ligne sur l'entree standard)")
+    args = parser.parse_args(argv)
+
+    model = FastModel(args.model)
+    lines = [args.json] if args.json is not None else sys.stdin
+    predictions = []
+    for line in lines:
+        if line.strip():
+            predictions.append(model.predict_one(json.loads(line)))
+            print(predictions[-1])
+    return predictions
+
+
+if __name__ == "__main__":
+    main()
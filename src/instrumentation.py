@@ -0,0 +1,84 @@
+"""
+Instrumentation optionnelle des etapes du pipeline
+
+Un objet StageMetrics passe en argument (metrics=...) enregistre, pour
+chaque etape nommee, la duree, le nombre de lignes et, si demande, la
+memoire allouee et le pic memoire (tracemalloc). Un callback recoit
+chaque mesure a la fin de l'etape pour l'envoyer dans nos propres logs.
+Sans metrics, les etapes passent par un contexte vide : cout quasi nul.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+class StageMetrics:
+    """Mesures par etape ; records contient un dict par etape executee"""
+
+    def __init__(self, callback=None, trace_memory=False):
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.records = []
+        # Pic memoire absolu de chaque etape ouverte (etapes imbriquees)
+        self._open_peaks = []
+
+    @contextmanager
+    def stage(self, name, rows=0):
+        """Mesure le bloc with ; produit la mesure, dont rows peut etre mis a jour"""
+        record = {'stage': name, 'rows': rows}
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            if self._open_peaks:
+                # reset_peak efface le pic du parent : on le garde avant
+                self._fold_peak(tracemalloc.get_traced_memory()[1])
+            self._open_peaks.append(0)
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, self._open_peaks.pop())
+                record['allocated_bytes'] = current - before
+                record['peak_bytes'] = peak - before
+                if self._open_peaks:
+                    self._fold_peak(peak)
+            if started_tracing:
+                tracemalloc.stop()
+            self.records.append(record)
+            if self.callback is not None:
+                self.callback(record)
+
+    def _fold_peak(self, peak):
+        """Reporte un pic memoire absolu sur l'etape ouverte la plus interne"""
+        self._open_peaks[-1] = max(self._open_peaks[-1], peak)
+
+    def totals(self):
+        """Duree et lignes cumulees par nom d'etape (utile en mode streaming)"""
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record['stage'], {'calls': 0, 'rows': 0, 'seconds': 0.0})
+            total['calls'] += 1
+            total['rows'] += record['rows']
+            total['seconds'] += record['seconds']
+        return totals
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.records)
+
+
+def stage(metrics, name, rows=0):
+    """Contexte de mesure d'une etape, ou contexte vide si metrics est None
+
+    Le contexte vide est cree a chaque appel : le dict produit, ignore, peut
+    etre modifie sans effet sur les autres etapes ni les autres threads.
+    """
+    if metrics is None:
+        return nullcontext({})
+    return metrics.stage(name, rows)
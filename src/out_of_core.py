@@ -0,0 +1,176 @@
+"""
+Entrainement hors memoire par partial_fit sur les blocs preprocesses
+
+Remplace train_test_split + model.fit de 02_Modeling.ipynb quand les
+donnees ne tiennent pas en RAM : les blocs encodes de preprocess_chunks
+sont repartis entre entrainement et test par un hash deterministe de leur
+numero de ligne (independant de la taille des blocs), le StandardScaler
+et les modeles incrementaux (SGDRegressor par defaut) apprennent par
+partial_fit, et les metriques RMSE / MAE / R² sont accumulees bloc par
+bloc. La memoire depend de chunksize et non de la taille du fichier.
+
+Exemple :
+    python src/out_of_core.py data/raw/StudentPerformanceFactors.csv --epochs 5
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from sklearn.linear_model import SGDRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from schema import TARGET
+from preprocessing import DEFAULT_CHUNKSIZE, fit_preprocessor, preprocess_chunks
+from compare import METRIC_COLUMNS
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def default_models(random_state=42):
+    """Modeles incrementaux candidats"""
+    return {
+        'SGD Regression': SGDRegressor(alpha=1e-4, random_state=random_state),
+        'SGD Elastic Net': SGDRegressor(penalty='elasticnet', alpha=1e-4, l1_ratio=0.15,
+                                        random_state=random_state)
+    }
+
+
+def hash_split(keys, test_size=0.2, seed=42):
+    """Masque des lignes de test, deterministe pour chaque cle entiere
+
+    Hash splitmix64 de (cle + seed) : une ligne reste du meme cote quel que
+    soit le decoupage en blocs ou l'ordre de lecture.
+    """
+    with np.errstate(over='ignore'):
+        z = np.asarray(keys).astype(np.uint64) + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return (z & _MASK64) >> np.uint64(11) < np.uint64(test_size * 2 ** 53)
+
+
+class StreamingMetrics:
+    """RMSE, MAE et R² accumules bloc par bloc en memoire constante"""
+
+    def __init__(self):
+        self.n = 0
+        self.sse = 0.0
+        self.sae = 0.0
+        # Moyenne et somme des carres centres de y (formule de Chan)
+        self.mean_y = 0.0
+        self.m2_y = 0.0
+
+    def update(self, y_true, y_pred):
+        y_true = np.asarray(y_true, dtype=np.float64)
+        n = len(y_true)
+        if n == 0:
+            return
+        errors = y_true - y_pred
+        self.sse += errors @ errors
+        self.sae += np.abs(errors).sum()
+
+        mean = y_true.mean()
+        m2 = ((y_true - mean) ** 2).sum()
+        total = self.n + n
+        delta = mean - self.mean_y
+        self.m2_y += m2 + delta ** 2 * self.n * n / total
+        self.mean_y += delta * n / total
+        self.n = total
+
+    def result(self):
+        """(rmse, mae, r2) comme compare.regression_metrics"""
+        return np.sqrt(self.sse / self.n), self.sae / self.n, 1 - self.sse / self.m2_y
+
+
+def _split_chunks(filepath, preprocessor, chunksize, test_size, seed):
+    """(X_train, y_train, X_test, y_test) pour chaque bloc preprocesse"""
+    for chunk in preprocess_chunks(filepath, chunksize, preprocessor):
+        test = hash_split(chunk.index, test_size, seed)
+        X = chunk.drop(columns=TARGET)
+        y = chunk[TARGET].to_numpy(np.float64)
+        yield X[~test], y[~test], X[test], y[test]
+
+
+def train_out_of_core(filepath, models=None, chunksize=DEFAULT_CHUNKSIZE, epochs=5,
+                      test_size=0.2, seed=42, preprocessor=None):
+    """Entraine chaque modele par partial_fit ; retourne (results_df, fitted_models)
+
+    Une passe apprend le preprocessing (sauf preprocessor fourni), une passe
+    le StandardScaler, epochs passes les modeles, une derniere passe les
+    metriques. results_df a les colonnes de model_metrics.csv ; chaque
+    modele entraine est un Pipeline(scaler, modele) pret pour score.py.
+    """
+    models = default_models(seed) if models is None else models
+    if preprocessor is None:
+        preprocessor = fit_preprocessor(filepath, chunksize)
+
+    def split_chunks():
+        return _split_chunks(filepath, preprocessor, chunksize, test_size, seed)
+
+    scaler = StandardScaler()
+    for X_train, _, _, _ in split_chunks():
+        if len(X_train):
+            scaler.partial_fit(X_train)
+
+    rng = np.random.default_rng(seed)
+    for _ in range(epochs):
+        for X_train, y_train, _, _ in split_chunks():
+            if len(X_train) == 0:
+                continue
+            # Ordre aleatoire dans le bloc : la descente de gradient y est sensible
+            order = rng.permutation(len(y_train))
+            X_scaled = scaler.transform(X_train.iloc[order])
+            for model in models.values():
+                model.partial_fit(X_scaled, y_train[order])
+
+    fitted = {name: Pipeline([('scaler', scaler), ('model', model)])
+              for name, model in models.items()}
+    metrics = {name: (StreamingMetrics(), StreamingMetrics()) for name in models}
+    for X_train, y_train, X_test, y_test in split_chunks():
+        for name, pipeline in fitted.items():
+            train_metrics, test_metrics = metrics[name]
+            if len(y_train):
+                train_metrics.update(y_train, pipeline.predict(X_train))
+            if len(y_test):
+                test_metrics.update(y_test, pipeline.predict(X_test))
+
+    results = pd.DataFrame.from_dict(
+        {name: dict(zip(METRIC_COLUMNS, train.result() + test.result()))
+         for name, (train, test) in metrics.items()}, orient='index')
+    results.index.name = 'model_name'
+    return results[METRIC_COLUMNS], fitted
+
+
+def main(argv=None):
+    import argparse
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Entrainement hors memoire par partial_fit")
+    parser.add_argument('input', help="CSV d'entrainement au format StudentPerformanceFactors.csv")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--test-size', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--metrics', default=None, help="CSV des metriques")
+    parser.add_argument('--model-dir', default=None,
+                        help="Dossier ou sauvegarder chaque modele (joblib)")
+    args = parser.parse_args(argv)
+
+    results, fitted = train_out_of_core(args.input, chunksize=args.chunksize, epochs=args.epochs,
+                                        test_size=args.test_size, seed=args.seed)
+    print(results.to_string())
+    if args.metrics:
+        results.reset_index().to_csv(args.metrics, index=False)
+    if args.model_dir:
+        os.makedirs(args.model_dir, exist_ok=True)
+        for name, pipeline in fitted.items():
+            joblib.dump(pipeline, os.path.join(args.model_dir,
+                                               name.lower().replace(' ', '_') + '.pkl'))
+    return results
+
+
+if __name__ == "__main__":
+    main()
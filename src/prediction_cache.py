@@ -0,0 +1,138 @@
+"""
+Cache des predictions, indexe par le vecteur de features encode
+
+Les tableaux de bord rescorent les memes etudiants toute la journee et
+l'espace des features (colonnes ordinales et binaires) contient beaucoup
+de doublons. PredictionCache se place devant model.predict :
+
+    - chaque ligne encodee est reduite a ses octets float64, qui servent
+      de cle (hachee par le dict, sans collision possible) ;
+    - les lignes identiques d'un meme lot sont dedupliquees (np.unique) et
+      chaque ligne unique non cachee est predite une seule fois, en un
+      seul appel vectorise ;
+    - les entrees forment un LRU borne (max_entries) avec une duree de vie
+      (ttl, en secondes) ;
+    - un changement de version du modele vide le cache.
+
+PredictionCache expose predict et les noms de features du modele :
+il s'utilise partout ou un modele est attendu (predict_batch, server.py).
+"""
+
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_TTL = 3600.0
+
+
+def model_version(model):
+    """Empreinte du contenu d'un modele (coefficients d'un .splm, sinon pickle)"""
+    if hasattr(model, 'coef') and hasattr(model, 'intercept'):
+        payload = np.asarray(model.coef, dtype=np.float64).tobytes() + repr(model.intercept).encode()
+    else:
+        payload = pickle.dumps(model)
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+class PredictionCache:
+    """LRU borne avec TTL devant model.predict"""
+
+    def __init__(self, model, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL,
+                 version=None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.duplicates = 0
+        self.expired = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.model = None
+        self.version = None
+        self.set_model(model, version)
+
+    def set_model(self, model, version=None):
+        """Remplace le modele ; le cache est vide si sa version change"""
+        version = model_version(model) if version is None else version
+        with self._lock:
+            if self.version is not None and version != self.version:
+                self._entries.clear()
+                self.invalidations += 1
+            self.model, self.version = model, version
+            names = getattr(model, 'feature_names_in_', getattr(model, 'feature_names', None))
+            if names is not None:
+                self.feature_names = list(names)
+
+    def predict(self, X):
+        """Predictions de X (n, n_features), les lignes cachees sans appel au modele"""
+        frame = X
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        if len(X) == 0:
+            return np.empty(0)
+        rows = X.view(np.dtype((np.void, X.dtype.itemsize * X.shape[1]))).ravel()
+        unique, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+        keys = [row.tobytes() for row in unique]
+
+        with self._lock:
+            now = self.clock()
+            values = np.empty(len(keys))
+            missing = []
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(key)
+                    values[i] = entry[0]
+                else:
+                    if entry is not None:
+                        self.expired += 1
+                    missing.append(i)
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+            self.duplicates += len(X) - len(keys)
+            model, version = self.model, self.version
+
+        if missing:
+            # Un seul appel au modele, sur les lignes uniques non cachees
+            positions = first[missing]
+            subset = frame.iloc[positions] if hasattr(frame, 'iloc') else X[positions]
+            values[missing] = model.predict(subset)
+            with self._lock:
+                if self.version != version:
+                    # Modele remplace pendant la prediction : resultats non caches
+                    return values[inverse.ravel()]
+                expires = self.clock() + self.ttl
+                for i in missing:
+                    self._entries[keys[i]] = (values[i], expires)
+                    self._entries.move_to_end(keys[i])
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return values[inverse.ravel()]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Compteurs du cache ; hit_rate porte sur les lignes uniques des lots"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'duplicates': self.duplicates,
+                'expired': self.expired,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'model_version': self.version
+            }
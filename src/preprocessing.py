@@ -1,9 +1,88 @@
+import pickle
+
 import pandas as pd
 import numpy as np
 
-def load_data(filepath):
-    """Charge les donnees depuis un fichier CSV"""
-    return pd.read_csv(filepath)
+from schema import (
+    TARGET,
+    NUMERIC_DTYPES,
+    ORDINAL_MAPPINGS,
+    IMPUTE_COLUMNS,
+    ONEHOT_COLUMNS,
+    CATEGORY_LEVELS,
+    learned_state,
+    feature_means
+)
+from instrumentation import stage
+from validation import QuarantineWriter, validate_chunks
+
+# Nombre de lignes lues a la fois en mode streaming
+DEFAULT_CHUNKSIZE = 100_000
+
+def _typed_dtypes():
+    """Types pandas des colonnes categorielles declarees dans le schema
+
+    Les categories sont celles lues dans le fichier et non les modalites
+    declarees : une modalite inconnue est conservee pour que la validation
+    la signale, puis encodee en NaN comme avec Series.map.
+    """
+    return {col: 'category' for col in CATEGORY_LEVELS}
+
+def _downcast(df):
+    """Convertit les colonnes numeriques vers leur type compact declare
+
+    Leve ValueError sur une valeur non numerique, non entiere (7.5 serait
+    tronque en 7) ou hors de la plage du type : valider avant de convertir
+    pour mettre ces lignes en quarantaine.
+    Exam_Score est plafonne a 100 comme dans handle_outliers, si bien qu'un
+    score superieur (accepte par la validation) tient dans le type compact.
+    """
+    for col, dtype in NUMERIC_DTYPES.items():
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if not pd.api.types.is_numeric_dtype(values.dtype):
+            try:
+                values = pd.to_numeric(values)
+            except (ValueError, TypeError):
+                raise ValueError(f"{col} : valeurs non numeriques") from None
+        if col == TARGET:
+            values = values.clip(upper=100)
+        if pd.api.types.is_float_dtype(values.dtype):
+            array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            if (array != np.floor(array))[~np.isnan(array)].any():
+                raise ValueError(f"{col} : valeurs non entieres")
+        if values.isna().any():
+            # Entiers avec trous : float32 represente exactement ces valeurs
+            df[col] = values.astype(np.float32)
+            continue
+        info = np.iinfo(dtype)
+        if len(values) and (values.min() < info.min or values.max() > info.max):
+            raise ValueError(f"{col} : valeurs hors de la plage du type {dtype}")
+        df[col] = values.astype(dtype)
+    return df
+
+def load_data(filepath, typed=False):
+    """Charge les donnees depuis un fichier CSV
+
+    Avec typed=True, les colonnes categorielles declarees dans le schema
+    sont chargees en dtype category et les colonnes numeriques en entiers
+    compacts.
+    """
+    if not typed:
+        return pd.read_csv(filepath)
+    return _downcast(pd.read_csv(filepath, dtype=_typed_dtypes()))
+
+def iter_chunks(filepath, chunksize=DEFAULT_CHUNKSIZE, typed=False, downcast=True):
+    """Lit un fichier CSV par blocs de chunksize lignes
+
+    downcast=False garde les colonnes numeriques telles que lues (pour les
+    valider avant de les convertir, voir _typed_valid_chunks).
+    """
+    dtype = _typed_dtypes() if typed else None
+    with pd.read_csv(filepath, chunksize=chunksize, dtype=dtype) as reader:
+        for chunk in reader:
+            yield _downcast(chunk) if typed and downcast else chunk
 
 def handle_outliers(df):
     """Traite les outliers"""
@@ -11,40 +90,284 @@ def handle_outliers(df):
     df.loc[df['Exam_Score'] > 100, 'Exam_Score'] = 100
     return df
 
-def preprocess_pipeline(filepath):
-    """Pipeline complet de preprocessing"""
+def _is_category(series):
+    return isinstance(series.dtype, pd.CategoricalDtype)
+
+def _encode_codes(series, mapping, mode=None):
+    """Encodage ordinal d'une colonne category par lookup sur ses codes
+
+    Le code -1 (valeur manquante) pointe sur la derniere case de la table,
+    qui contient l'encodage du mode.
+    """
+    fill = mapping.get(mode, np.nan)
+    lookup = np.array([mapping.get(cat, np.nan) for cat in series.cat.categories] + [fill],
+                      dtype=np.float32)
+    values = lookup[series.cat.codes.to_numpy()]
+    if not np.isnan(values).any():
+        values = values.astype(np.int8)
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+class Preprocessor:
+    """Preprocessing appris sur les donnees d'entrainement
+
+    fit() memorise les modes, les categories one-hot et le schema des
+    colonnes de sortie ; transform() et transform_one() reappliquent cet
+    etat sans jamais recalculer de statistiques sur les donnees a scorer.
+    Les sommes des colonnes numeriques donnent en plus la moyenne de chaque
+    feature encodee (feature_means_), sans relire les donnees.
+    """
+
+    def __init__(self):
+        self.input_columns_ = None
+        self.counts_ = None
+        self.sums_ = None
+        self.rows_ = 0
+        self.modes_ = None
+        self.categories_ = None
+        self.columns_ = None
+
+    def fit(self, df):
+        """Apprend l'etat du preprocessing sur un DataFrame brut"""
+        self.input_columns_ = None
+        self.counts_ = None
+        self.sums_ = None
+        self.rows_ = 0
+        return self.partial_fit(df)
+
+    def partial_fit(self, df):
+        """Met a jour les comptages de categories avec un nouveau bloc de lignes"""
+        if self.input_columns_ is None:
+            self.input_columns_ = list(df.columns)
+            self.counts_ = {col: {} for col in dict.fromkeys(
+                IMPUTE_COLUMNS + ONEHOT_COLUMNS + list(ORDINAL_MAPPINGS))}
+            self.sums_ = {col: [0.0, 0] for col in self.input_columns_
+                          if col != TARGET and col not in self.counts_}
+        for col, counts in self.counts_.items():
+            for value, count in df[col].value_counts().items():
+                # Les modalites absentes d'une colonne category ont un compte nul
+                if count:
+                    counts[value] = counts.get(value, 0) + int(count)
+        for col, total in self.sums_.items():
+            values = pd.to_numeric(df[col], errors='coerce')
+            total[0] += float(values.sum())
+            total[1] += int(values.count())
+        self.rows_ += len(df)
+        self._finalize()
+        return self
+
+    def merge(self, other):
+        """Ajoute les comptages appris par un autre Preprocessor (autre fichier)"""
+        if other.input_columns_ is None:
+            return self
+        if self.input_columns_ is None:
+            self.input_columns_ = list(other.input_columns_)
+            self.counts_ = {col: {} for col in other.counts_}
+            self.sums_ = {col: [0.0, 0] for col in other.sums_}
+        elif other.input_columns_ != self.input_columns_:
+            raise ValueError("Colonnes differentes entre les fichiers fusionnes")
+        for col, counts in other.counts_.items():
+            for value, count in counts.items():
+                self.counts_[col][value] = self.counts_[col].get(value, 0) + count
+        if self.sums_ is None or other.sums_ is None:
+            self.sums_ = None
+        else:
+            for col, (total, count) in other.sums_.items():
+                self.sums_[col][0] += total
+                self.sums_[col][1] += count
+        self.rows_ += other.rows_
+        self._finalize()
+        return self
+
+    def _finalize(self):
+        self.modes_, self.categories_, self.columns_ = learned_state(
+            self.input_columns_, self.counts_)
+
+    def to_dict(self):
+        """Etat appris sous forme JSON-serialisable"""
+        self._check_fitted()
+        return {'input_columns': list(self.input_columns_),
+                'counts': {col: dict(counts) for col, counts in self.counts_.items()},
+                'sums': {col: list(total) for col, total in self.sums_.items()},
+                'rows': self.rows_}
+
+    @classmethod
+    def from_dict(cls, state):
+        """Reconstruit un Preprocessor a partir de to_dict()"""
+        preprocessor = cls()
+        preprocessor.input_columns_ = list(state['input_columns'])
+        preprocessor.counts_ = {col: dict(counts) for col, counts in state['counts'].items()}
+        # Etats anterieurs aux moyennes de features : sums absent
+        if 'sums' in state:
+            preprocessor.sums_ = {col: list(total) for col, total in state['sums'].items()}
+            preprocessor.rows_ = state['rows']
+        preprocessor._finalize()
+        return preprocessor
+
+    @property
+    def feature_means_(self):
+        """Moyenne de chaque feature encodee a l'entrainement (None si inconnue)"""
+        self._check_fitted()
+        if self.sums_ is None:
+            return None
+        return feature_means(self.input_columns_, self.counts_, self.sums_, self.rows_)
+
+    @property
+    def feature_columns_(self):
+        """Colonnes de sortie sans la cible"""
+        return [col for col in self.columns_ if col != TARGET]
+
+    def _output_columns(self, has_target):
+        return self.columns_ if has_target else self.feature_columns_
+
+    def transform(self, df, metrics=None):
+        """Applique le preprocessing appris a un DataFrame brut
+
+        metrics : StageMetrics optionnel, mesure chaque etape.
+        """
+        self._check_fitted()
+        has_target = TARGET in df.columns
+        rows = len(df)
+
+        # 1. Correction des outliers
+        with stage(metrics, 'outliers', rows):
+            df = handle_outliers(df) if has_target else df.copy()
+
+        # 2. Remplissage des valeurs manquantes
+        # (fait sur les codes pour les colonnes category, etape 3)
+        with stage(metrics, 'remplissage', rows):
+            for col, mode in self.modes_.items():
+                if mode is not None and not _is_category(df[col]):
+                    df[col] = df[col].fillna(mode)
+
+        # 3. Encodage ordinal
+        with stage(metrics, 'encodage_ordinal', rows):
+            for col, mapping in ORDINAL_MAPPINGS.items():
+                if _is_category(df[col]):
+                    df[col] = _encode_codes(df[col], mapping, self.modes_.get(col))
+                else:
+                    df[col] = df[col].map(mapping)
+
+        # 4. One-hot encoding sur les categories apprises
+        with stage(metrics, 'one_hot', rows):
+            for col in ONEHOT_COLUMNS:
+                df[col] = pd.Categorical(df[col], categories=self.categories_[col])
+            df = pd.get_dummies(df, columns=ONEHOT_COLUMNS, drop_first=True)
+
+        return df[self._output_columns(has_target)]
+
+    def transform_one(self, record):
+        """Encode un seul etudiant (dict colonne -> valeur) par simple lookup"""
+        self._check_fitted()
+        has_target = TARGET in record
+        values = []
+        for col in self.input_columns_:
+            if col in ONEHOT_COLUMNS or (col == TARGET and not has_target):
+                continue
+            value = record[col]
+            if col in self.modes_ and (value is None or value != value):
+                value = self.modes_[col]
+            if col in ORDINAL_MAPPINGS:
+                value = ORDINAL_MAPPINGS[col].get(value, np.nan)
+            if col == TARGET and value > 100:
+                value = 100
+            values.append(value)
+        for col in ONEHOT_COLUMNS:
+            values += [record[col] == cat for cat in self.categories_[col][1:]]
+        return pd.DataFrame([values], columns=self._output_columns(has_target))
+
+    def _check_fitted(self):
+        if self.columns_ is None:
+            raise ValueError("Preprocessor non entraine : appeler fit() d'abord")
+
+    def save(self, filepath):
+        """Sauvegarde l'etat appris"""
+        with open(filepath, 'wb') as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(filepath):
+        """Recharge un Preprocessor sauvegarde avec save()"""
+        with open(filepath, 'rb') as f:
+            return pickle.load(f)
+
+
+def preprocess_pipeline(filepath, typed=False, metrics=None):
+    """Pipeline complet de preprocessing
+
+    metrics : StageMetrics optionnel (duree, lignes, memoire par etape).
+    """
     
     # 1. Chargement
-    df = load_data(filepath)
-    
-    # 2. Correction des outliers
-    df = handle_outliers(df)
+    with stage(metrics, 'chargement') as record:
+        df = load_data(filepath, typed)
+        record['rows'] = len(df)
     
-    # 3. REMPLISSAGE DES VALEURS MANQUANTES
-    df['Teacher_Quality'] = df['Teacher_Quality'].fillna(df['Teacher_Quality'].mode()[0])
-    df['Parental_Education_Level'] = df['Parental_Education_Level'].fillna(df['Parental_Education_Level'].mode()[0])
-    df['Distance_from_Home'] = df['Distance_from_Home'].fillna(df['Distance_from_Home'].mode()[0])
-    
-    # 4. ENCODAGE ORDINAL
-    ordinal_mappings = {
-        'Parental_Involvement': {'Low': 0, 'Medium': 1, 'High': 2},
-        'Access_to_Resources': {'Low': 0, 'Medium': 1, 'High': 2},
-        'Motivation_Level': {'Low': 0, 'Medium': 1, 'High': 2},
-        'Family_Income': {'Low': 0, 'Medium': 1, 'High': 2},
-        'Teacher_Quality': {'Low': 0, 'Medium': 1, 'High': 2},
-        'Parental_Education_Level': {'High School': 0, 'College': 1, 'Postgraduate': 2},
-        'Distance_from_Home': {'Near': 0, 'Moderate': 1, 'Far': 2}
-    }
-    
-    for col, mapping in ordinal_mappings.items():
-        df[col] = df[col].map(mapping)
-    
-    # 5. ONE-HOT ENCODING
-    df = pd.get_dummies(df, columns=['School_Type'], drop_first=True)
-    df = pd.get_dummies(df, columns=['Peer_Influence'], drop_first=True)
-    df = pd.get_dummies(df, columns=['Extracurricular_Activities'], drop_first=True)
-    df = pd.get_dummies(df, columns=['Internet_Access'], drop_first=True)
-    df = pd.get_dummies(df, columns=['Learning_Disabilities'], drop_first=True)
-    df = pd.get_dummies(df, columns=['Gender'], drop_first=True)
-    
-    return df
\ No newline at end of file
+    # 2. Apprentissage (modes, categories) et application sur le meme fichier
+    with stage(metrics, 'apprentissage', len(df)):
+        preprocessor = Preprocessor().fit(df)
+    return preprocessor.transform(df, metrics)
+
+
+def _valid_chunks(filepath, chunksize, typed, quarantine=None, metrics=None):
+    """Blocs valides : validation sur les valeurs lues, conversion compacte ensuite
+
+    Une valeur illisible ou hors plage est ainsi mise en quarantaine au lieu
+    de faire echouer la conversion de tout le bloc.
+    """
+    chunks = iter_chunks(filepath, chunksize, typed, downcast=False)
+    for chunk in validate_chunks(chunks, quarantine, metrics=metrics):
+        yield _downcast(chunk) if typed else chunk
+
+def fit_preprocessor(filepath, chunksize=DEFAULT_CHUNKSIZE, typed=False, validate=False):
+    """Apprend un Preprocessor en une passe sur le CSV, bloc par bloc
+
+    Avec validate=True, seules les lignes valides (voir validation.py) sont
+    apprises : une modalite inconnue n'ajoute pas de colonne one-hot.
+    """
+    preprocessor = Preprocessor()
+    if validate:
+        chunks = _valid_chunks(filepath, chunksize, typed)
+    else:
+        chunks = iter_chunks(filepath, chunksize, typed)
+    for chunk in chunks:
+        preprocessor.partial_fit(chunk)
+    return preprocessor
+
+
+def preprocess_chunks(filepath, chunksize=DEFAULT_CHUNKSIZE, preprocessor=None, typed=False,
+                      metrics=None, quarantine=None):
+    """Version streaming de preprocess_pipeline
+
+    Genere les blocs encodes un par un : la memoire depend de chunksize et
+    non de la taille du fichier. Sans preprocessor deja entraine, une
+    premiere passe sur le fichier calcule les memes modes et categories que
+    preprocess_pipeline, si bien que la concatenation des blocs est
+    identique a sa sortie. Avec metrics, chaque etape est mesuree bloc par
+    bloc (voir StageMetrics.totals pour les cumuls).
+
+    quarantine : chemin d'un CSV ; les lignes brutes sont alors validees,
+    les lignes invalides y sont ecrites avec leurs motifs et seules les
+    lignes valides sont apprises et encodees.
+    """
+    validate = quarantine is not None
+    if preprocessor is None:
+        with stage(metrics, 'apprentissage'):
+            preprocessor = fit_preprocessor(filepath, chunksize, typed, validate)
+    writer = QuarantineWriter(quarantine) if validate else None
+    if validate:
+        # Validation avant conversion (etape 'validation', incluse dans 'chargement')
+        chunks = _valid_chunks(filepath, chunksize, typed, writer, metrics)
+    else:
+        chunks = iter_chunks(filepath, chunksize, typed)
+    try:
+        while True:
+            with stage(metrics, 'chargement') as record:
+                chunk = next(chunks, None)
+                record['rows'] = 0 if chunk is None else len(chunk)
+            if chunk is None:
+                return
+            yield preprocessor.transform(chunk, metrics)
+    finally:
+        if writer is not None:
+            writer.close()
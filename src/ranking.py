@@ -0,0 +1,150 @@
+"""
+Classement des etudiants les plus a risque pendant le scoring par lots
+
+TopKAtRisk garde, au fil des lots de predictions, les k etudiants au
+Exam_Score predit le plus bas, au global et par groupe (ex. School_Type
+ou un identifiant d'ecole). Chaque lot est d'abord reduit de facon
+vectorisee (argpartition / tri par groupe) a ses k meilleurs candidats
+par groupe, puis fusionne dans un tas borne : la memoire est
+O(k x groupes) et aucun tri global des predictions n'est necessaire.
+
+LinearExplainer indique, pour un modele lineaire, les features qui
+tirent le plus chaque score vers le bas par rapport a l'etudiant moyen
+des donnees d'entrainement (moyennes stockees dans le Preprocessor).
+"""
+
+import heapq
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from schema import TARGET
+from encoding import encode
+
+OVERALL = 'TOUS'
+PREDICTION_COLUMN = 'Predicted_Exam_Score'
+
+
+class TopKAtRisk:
+    """k predictions les plus basses, au global et par valeur de group_by"""
+
+    def __init__(self, k=10, group_by=None):
+        self.k = k
+        self.group_by = group_by
+        # Tas max (score negatif) de taille k par groupe
+        self._heaps = {}
+        self._sequence = itertools.count()
+
+    def _push(self, group, predictions, chunk, positions):
+        heap = self._heaps.setdefault(group, [])
+        if len(heap) == self.k:
+            # Seuls les scores sous le k-ieme actuel peuvent entrer
+            positions = positions[predictions[positions] < -heap[0][0]]
+        for position in positions:
+            item = (-predictions[position], next(self._sequence),
+                    chunk.index[position], chunk.iloc[position].to_dict())
+            if len(heap) < self.k:
+                heapq.heappush(heap, item)
+            else:
+                heapq.heappushpop(heap, item)
+
+    def update(self, chunk, predictions):
+        """Integre un lot brut (index = numero de ligne) et ses predictions"""
+        predictions = np.asarray(predictions, dtype=np.float64)
+        n = len(predictions)
+        if n == 0:
+            return
+
+        if n > self.k:
+            best = np.argpartition(predictions, self.k - 1)[:self.k]
+        else:
+            best = np.arange(n)
+        self._push(OVERALL, predictions, chunk, best)
+
+        if self.group_by is None:
+            return
+        codes, groups = pd.factorize(chunk[self.group_by])
+        # Tri par (groupe, prediction) : les k premiers de chaque segment
+        order = np.lexsort((predictions, codes))
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        stops = np.r_[starts[1:], n]
+        for start, stop in zip(starts, stops):
+            code = sorted_codes[start]
+            group = groups[code] if code >= 0 else None
+            self._push(group, predictions, chunk, order[start:min(stop, start + self.k)])
+
+    def to_frame(self, explainer=None, n_drivers=3):
+        """Classement final : une ligne par etudiant retenu, par groupe
+
+        Colonnes : group, rank, row, Predicted_Exam_Score, drivers (si un
+        explainer est fourni) puis les colonnes brutes de l'etudiant.
+        """
+        frames = []
+        groups = [OVERALL] + sorted((g for g in self._heaps if g != OVERALL), key=str)
+        for group in groups:
+            items = sorted(self._heaps.get(group, []), key=lambda item: (-item[0], item[1]))
+            if not items:
+                continue
+            records = pd.DataFrame([record for _, _, _, record in items])
+            frame = pd.DataFrame({
+                'group': group,
+                'rank': np.arange(1, len(items) + 1),
+                'row': [row for _, _, row, _ in items],
+                PREDICTION_COLUMN: [-score for score, _, _, _ in items]
+            })
+            if explainer is not None:
+                frame['drivers'] = explainer.drivers(records, n_drivers)
+            frames.append(pd.concat([frame, records], axis=1))
+        if not frames:
+            return pd.DataFrame(columns=['group', 'rank', 'row', PREDICTION_COLUMN])
+        return pd.concat(frames, ignore_index=True)
+
+
+class LinearExplainer:
+    """Contributions coef * (x - x_moyen) d'un modele lineaire"""
+
+    def __init__(self, coef, feature_names, reference, preprocessor):
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.feature_names = list(feature_names)
+        self.reference = np.asarray(reference, dtype=np.float64)
+        self.preprocessor = preprocessor
+
+    @classmethod
+    def from_model(cls, model, preprocessor):
+        """Explainer d'un modele lineaire (sklearn ou .splm)
+
+        La reference est la moyenne des features d'entrainement stockee dans
+        le Preprocessor (feature_means_) : les donnees d'entrainement ne sont
+        pas relues. Retourne None si le modele n'est pas lineaire ; leve
+        ValueError si l'etat de preprocessing ne contient pas ces moyennes.
+        """
+        if hasattr(model, 'coef_'):
+            coef = np.ravel(model.coef_)
+            names = list(getattr(model, 'feature_names_in_', preprocessor.feature_columns_))
+        elif hasattr(model, 'coef'):
+            coef, names = model.coef, model.feature_names
+        else:
+            return None
+
+        means = preprocessor.feature_means_
+        if means is None:
+            raise ValueError("Preprocessor sans moyennes de features : le reapprendre "
+                             "ou reexporter le modele")
+        return cls(coef, names, [means[name] for name in names], preprocessor)
+
+    def contributions(self, records):
+        """Contribution de chaque feature au score, par rapport a la moyenne"""
+        X = encode(records.drop(columns=TARGET, errors='ignore'), self.preprocessor, as_frame=True)
+        return (X[self.feature_names].to_numpy() - self.reference) * self.coef
+
+    def drivers(self, records, n=3):
+        """Les n features qui font le plus baisser chaque score, en texte"""
+        contributions = self.contributions(records)
+        texts = []
+        for row in contributions:
+            order = np.argsort(row)[:n]
+            texts.append('; '.join(f'{self.feature_names[j]} ({row[j]:+.2f})'
+                                   for j in order if row[j] < 0))
+        return texts
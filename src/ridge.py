@@ -0,0 +1,181 @@
+"""
+Regression Ridge par statistiques suffisantes
+
+Une seule passe sur les donnees accumule n, les moyennes et les
+co-moments centres X'X, X'y, y'y. Ces statistiques se fusionnent entre
+blocs ou fichiers (formule de Chan), s'enrichissent de nouvelles lignes
+sans reentrainement complet, et suffisent a resoudre toute la grille
+d'alpha a partir d'une seule decomposition en valeurs propres. Le cout
+de resolution ne depend plus du nombre de lignes.
+
+Les coefficients sont ceux de sklearn.linear_model.Ridge(fit_intercept=True).
+"""
+
+import numpy as np
+
+from schema import TARGET
+
+
+class RidgeStats:
+    """Statistiques suffisantes d'un probleme Ridge avec intercept"""
+
+    def __init__(self, n_features, columns=None):
+        self.columns = columns
+        self.n = 0
+        self.mean_x = np.zeros(n_features)
+        self.mean_y = 0.0
+        self.xx = np.zeros((n_features, n_features))
+        self.xy = np.zeros(n_features)
+        self.yy = 0.0
+
+    @classmethod
+    def from_data(cls, X, y, columns=None):
+        """Statistiques d'un bloc (X, y)"""
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        stats = cls(X.shape[1], columns)
+        if len(y) == 0:
+            return stats
+        stats.n = len(y)
+        stats.mean_x = X.mean(axis=0)
+        stats.mean_y = y.mean()
+        Xc = X - stats.mean_x
+        yc = y - stats.mean_y
+        stats.xx = Xc.T @ Xc
+        stats.xy = Xc.T @ yc
+        stats.yy = yc @ yc
+        return stats
+
+    def copy(self):
+        stats = RidgeStats(len(self.mean_x), self.columns)
+        stats.n = self.n
+        stats.mean_x = self.mean_x.copy()
+        stats.mean_y = self.mean_y
+        stats.xx = self.xx.copy()
+        stats.xy = self.xy.copy()
+        stats.yy = self.yy
+        return stats
+
+    def merge(self, other):
+        """Ajoute les statistiques d'un autre bloc (en place)"""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean_x, self.mean_y = other.n, other.mean_x.copy(), other.mean_y
+            self.xx, self.xy, self.yy = other.xx.copy(), other.xy.copy(), other.yy
+            return self
+        n = self.n + other.n
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        weight = self.n * other.n / n
+        self.xx += other.xx + weight * np.outer(dx, dx)
+        self.xy += other.xy + weight * dx * dy
+        self.yy += other.yy + weight * dy * dy
+        self.mean_x += dx * other.n / n
+        self.mean_y += dy * other.n / n
+        self.n = n
+        return self
+
+    def update(self, X, y):
+        """Ajoute de nouvelles lignes sans repasser sur les anciennes"""
+        return self.merge(RidgeStats.from_data(X, y, self.columns))
+
+    def solve_path(self, alphas):
+        """Coefficients et intercepts pour chaque alpha (une seule decomposition)"""
+        eigenvalues, eigenvectors = np.linalg.eigh(self.xx)
+        projected = eigenvectors.T @ self.xy
+        alphas = np.atleast_1d(np.asarray(alphas, dtype=np.float64))
+        coefs = (projected / (eigenvalues + alphas[:, None])) @ eigenvectors.T
+        intercepts = self.mean_y - coefs @ self.mean_x
+        return coefs, intercepts
+
+    def solve(self, alpha=1.0):
+        """Coefficients et intercept pour un alpha"""
+        coefs, intercepts = self.solve_path([alpha])
+        return coefs[0], intercepts[0]
+
+    def r2(self, coef, intercept):
+        """R² de (coef, intercept) sur les lignes resumees par ces statistiques"""
+        offset = self.mean_y - self.mean_x @ coef - intercept
+        sse = self.yy - 2 * coef @ self.xy + coef @ self.xx @ coef + self.n * offset ** 2
+        return 1 - sse / self.yy
+
+
+def stats_from_chunks(chunks, target=TARGET, n_folds=None, fold_of=None):
+    """Accumule les statistiques sur des blocs preprocesses (ex. preprocess_chunks)
+
+    Avec n_folds, retourne une RidgeStats par fold (pour cross_validate),
+    toujours en une seule passe. fold_of(index, n_folds) donne le fold de
+    chaque ligne a partir de l'index du bloc (numero de ligne) ; par defaut
+    index % n_folds. contiguous_folds reproduit le decoupage de fold_stats.
+    """
+    stats = None
+    for chunk in chunks:
+        features = [col for col in chunk.columns if col != target]
+        X = chunk[features].to_numpy(dtype=np.float64)
+        y = chunk[target].to_numpy(dtype=np.float64)
+        if n_folds is None:
+            if stats is None:
+                stats = RidgeStats(len(features), features)
+            stats.update(X, y)
+            continue
+        if stats is None:
+            stats = [RidgeStats(len(features), features) for _ in range(n_folds)]
+        index = chunk.index.to_numpy()
+        folds = fold_of(index, n_folds) if fold_of is not None else index % n_folds
+        for k, fold in enumerate(stats):
+            mask = folds == k
+            if mask.any():
+                fold.update(X[mask], y[mask])
+    return stats
+
+
+def _fold_bounds(n_rows, n_folds):
+    """Bornes des folds contigus de KFold(n_folds) sur n_rows lignes"""
+    sizes = np.full(n_folds, n_rows // n_folds)
+    sizes[:n_rows % n_folds] += 1
+    return np.concatenate([[0], np.cumsum(sizes)])
+
+
+def contiguous_folds(n_rows):
+    """fold_of pour stats_from_chunks : folds contigus par numero de ligne"""
+    def fold_of(index, n_folds):
+        return np.searchsorted(_fold_bounds(n_rows, n_folds), index, side='right') - 1
+    return fold_of
+
+
+def fold_stats(X, y, n_folds=5):
+    """Statistiques par fold, decoupage contigu identique a KFold(n_folds)"""
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    bounds = _fold_bounds(len(y), n_folds)
+    return [RidgeStats.from_data(X[start:stop], y[start:stop])
+            for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def cross_validate(folds, alphas):
+    """Scores R² de validation croisee, tableau (n_alphas, n_folds)
+
+    Chaque fold est evalue avec le modele resolu sur la fusion des autres
+    folds, comme GridSearchCV(Ridge(), {'alpha': alphas}, scoring='r2').
+    """
+    scores = np.empty((len(alphas), len(folds)))
+    for k, test in enumerate(folds):
+        train = RidgeStats(len(test.mean_x))
+        for i, fold in enumerate(folds):
+            if i != k:
+                train.merge(fold)
+        coefs, intercepts = train.solve_path(alphas)
+        for a in range(len(alphas)):
+            scores[a, k] = test.r2(coefs[a], intercepts[a])
+    return scores
+
+
+def grid_search(folds, alphas):
+    """Meilleur alpha selon le R² moyen de validation croisee
+
+    Retourne (best_alpha, mean_scores) ; les statistiques completes pour le
+    modele final s'obtiennent en fusionnant les folds.
+    """
+    mean_scores = cross_validate(folds, alphas).mean(axis=1)
+    return alphas[int(np.argmax(mean_scores))], mean_scores
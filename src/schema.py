@@ -0,0 +1,122 @@
+"""
+Schema declare du dataset StudentPerformanceFactors.csv
+
+Ce module ne depend que de la bibliotheque standard : il decrit les
+colonnes (types compacts, modalites, encodages) et peut etre importe
+sans charger pandas.
+"""
+
+TARGET = 'Exam_Score'
+
+# Colonnes numeriques et type entier compact utilise au chargement
+NUMERIC_DTYPES = {
+    'Hours_Studied': 'int8',
+    'Attendance': 'int8',
+    'Sleep_Hours': 'int8',
+    'Previous_Scores': 'int8',
+    'Tutoring_Sessions': 'int8',
+    'Physical_Activity': 'int8',
+    'Exam_Score': 'int8'
+}
+
+# Plages valides (bornes incluses, None = pas de borne) utilisees par la validation.
+# Les scores > 100 restent acceptes : handle_outliers les ramene a 100.
+NUMERIC_RANGES = {
+    'Hours_Studied': (0, 100),
+    'Attendance': (0, 100),
+    'Sleep_Hours': (0, 24),
+    'Previous_Scores': (0, 100),
+    'Tutoring_Sessions': (0, 50),
+    'Physical_Activity': (0, 50),
+    'Exam_Score': (0, None)
+}
+
+ORDINAL_MAPPINGS = {
+    'Parental_Involvement': {'Low': 0, 'Medium': 1, 'High': 2},
+    'Access_to_Resources': {'Low': 0, 'Medium': 1, 'High': 2},
+    'Motivation_Level': {'Low': 0, 'Medium': 1, 'High': 2},
+    'Family_Income': {'Low': 0, 'Medium': 1, 'High': 2},
+    'Teacher_Quality': {'Low': 0, 'Medium': 1, 'High': 2},
+    'Parental_Education_Level': {'High School': 0, 'College': 1, 'Postgraduate': 2},
+    'Distance_from_Home': {'Near': 0, 'Moderate': 1, 'Far': 2}
+}
+
+# Colonnes imputees par leur mode
+IMPUTE_COLUMNS = ['Teacher_Quality', 'Parental_Education_Level', 'Distance_from_Home']
+
+# Variables nominales encodees en one-hot (drop_first=True)
+ONEHOT_COLUMNS = [
+    'School_Type',
+    'Peer_Influence',
+    'Extracurricular_Activities',
+    'Internet_Access',
+    'Learning_Disabilities',
+    'Gender'
+]
+
+# Modalites autorisees de chaque variable categorielle
+# (ordre ordinal pour les variables ordinales, ordre alphabetique sinon)
+CATEGORY_LEVELS = {
+    col: sorted(mapping, key=mapping.get) for col, mapping in ORDINAL_MAPPINGS.items()
+}
+CATEGORY_LEVELS.update({
+    'School_Type': ['Private', 'Public'],
+    'Peer_Influence': ['Negative', 'Neutral', 'Positive'],
+    'Extracurricular_Activities': ['No', 'Yes'],
+    'Internet_Access': ['No', 'Yes'],
+    'Learning_Disabilities': ['No', 'Yes'],
+    'Gender': ['Female', 'Male']
+})
+
+
+def learned_state(input_columns, counts):
+    """Modes, categories one-hot et colonnes de sortie a partir des comptages
+
+    counts associe a chaque colonne imputee ou one-hot le nombre
+    d'occurrences de chaque modalite observee a l'entrainement.
+    """
+    # Mode : valeur la plus frequente, la plus petite en cas d'egalite
+    # (meme convention que Series.mode()[0])
+    modes = {}
+    for col in IMPUTE_COLUMNS:
+        best = max(counts[col].values(), default=0)
+        modes[col] = min((v for v, c in counts[col].items() if c == best), default=None)
+
+    categories = {col: sorted(counts[col]) for col in ONEHOT_COLUMNS}
+
+    columns = [col for col in input_columns if col not in ONEHOT_COLUMNS]
+    for col in ONEHOT_COLUMNS:
+        columns += [f'{col}_{cat}' for cat in categories[col][1:]]
+    return modes, categories, columns
+
+
+def feature_means(input_columns, counts, sums, rows):
+    """Moyenne de chaque feature encodee sur les donnees d'entrainement
+
+    Calculee sans repasser sur les donnees : sums associe a chaque colonne
+    numerique [somme, nombre de valeurs non vides], counts les comptages de
+    modalites de chaque colonne categorielle, rows le nombre de lignes.
+    Memes regles que l'encodage : valeur manquante imputee par le mode,
+    modalite ordinale inconnue ignoree, one-hot a 0 hors categorie.
+    """
+    modes, categories, columns = learned_state(input_columns, counts)
+    means = {}
+    for col in input_columns:
+        if col == TARGET or col in ONEHOT_COLUMNS:
+            continue
+        if col in ORDINAL_MAPPINGS:
+            mapping = ORDINAL_MAPPINGS[col]
+            total = sum(mapping[v] * c for v, c in counts[col].items() if v in mapping)
+            n = sum(c for v, c in counts[col].items() if v in mapping)
+            if modes.get(col) is not None:
+                missing = rows - sum(counts[col].values())
+                total += mapping.get(modes[col], 0) * missing
+                n += missing
+        else:
+            total, n = sums[col]
+        means[col] = total / n if n else float('nan')
+    for col in ONEHOT_COLUMNS:
+        for cat in categories[col][1:]:
+            means[f'{col}_{cat}'] = counts[col][cat] / rows if rows else float('nan')
+    # Meme ordre que les colonnes de sortie
+    return {col: means[col] for col in columns if col != TARGET}
@@ -0,0 +1,215 @@
+"""
+Scoring par lots en ligne de commande
+
+Charge le modele sauvegarde une seule fois, lit le CSV d'entree par blocs,
+encode chaque bloc avec l'etat de preprocessing appris, predit le bloc en
+un seul appel vectorise et ecrit les predictions au fur et a mesure.
+
+Exemple :
+    python src/score.py etudiants.csv predictions.csv --batch-size 50000 --workers 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from schema import TARGET
+from preprocessing import Preprocessor, fit_preprocessor, iter_chunks
+from encoding import encode
+from artifact import load_linear
+from validation import QuarantineWriter, validate_chunks
+from ranking import PREDICTION_COLUMN, LinearExplainer, TopKAtRisk
+from drift import DriftMonitor, DriftReference
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+DEFAULT_MODEL = os.path.join(ROOT_DIR, 'models', 'final_model.pkl')
+DEFAULT_PREPROCESSOR = os.path.join(ROOT_DIR, 'models', 'preprocessor.pkl')
+DEFAULT_BATCH_SIZE = 50_000
+
+# Etat charge une fois par processus worker
+_worker_state = {}
+
+
+def load_model(model_path):
+    """Charge un modele joblib (.pkl) ou un modele lineaire compact (.splm)
+
+    joblib (et scikit-learn au depickling) n'est importe que pour un .pkl.
+    """
+    if model_path.endswith('.splm'):
+        return load_linear(model_path)
+    import joblib
+    return joblib.load(model_path)
+
+
+def load_preprocessor(model=None, preprocessor_path=None, train_data=None):
+    """Etat de preprocessing du modele, sans reapprentissage par defaut
+
+    Par ordre de priorite : reapprentissage sur train_data (uniquement si
+    demande), Preprocessor sauvegarde preprocessor_path, etat stocke dans
+    un .splm, puis models/preprocessor.pkl.
+    """
+    if train_data is not None:
+        return fit_preprocessor(train_data)
+    if preprocessor_path is not None:
+        return Preprocessor.load(preprocessor_path)
+    if hasattr(model, 'preprocessor'):
+        return model.preprocessor()
+    return Preprocessor.load(DEFAULT_PREPROCESSOR)
+
+
+def add_preprocessor_arguments(parser):
+    """Options --preprocessor / --train-data (exclusives) des CLI de scoring"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--preprocessor', default=None,
+                       help="Preprocessor sauvegarde (defaut : celui du .splm, "
+                            "sinon models/preprocessor.pkl)")
+    group.add_argument('--train-data', default=None,
+                       help="CSV d'entrainement : reapprend le preprocessing")
+
+
+def predict_batch(model, preprocessor, chunk):
+    """Predit un bloc brut en un seul appel vectorise"""
+    X = encode(chunk.drop(columns=TARGET, errors='ignore'), preprocessor, as_frame=True)
+    if hasattr(model, 'feature_names_in_'):
+        X = X[list(model.feature_names_in_)]
+    elif hasattr(model, 'feature_names'):
+        X = X[model.feature_names]
+    return model.predict(X)
+
+
+def _init_worker(model, preprocessor):
+    _worker_state['model'] = model
+    _worker_state['preprocessor'] = preprocessor
+
+
+def _predict_in_worker(chunk):
+    return predict_batch(_worker_state['model'], _worker_state['preprocessor'], chunk)
+
+
+def _predictions(chunks, model, preprocessor, workers):
+    """Predictions bloc par bloc, dans l'ordre, avec au plus 2 blocs en attente par worker"""
+    if workers <= 1:
+        for chunk in chunks:
+            yield chunk, predict_batch(model, preprocessor, chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model, preprocessor)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(_predict_in_worker, chunk)))
+            if len(pending) >= 2 * workers:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+
+def score_file(input_path, output_path, model, preprocessor,
+               batch_size=DEFAULT_BATCH_SIZE, workers=1, quarantine=None, ranking=None,
+               drift=None):
+    """Score un CSV bloc par bloc et ecrit les predictions dans output_path
+
+    quarantine : chemin d'un CSV ; les lignes invalides y sont ecrites avec
+    leurs motifs au lieu d'etre scorees.
+    ranking : TopKAtRisk mis a jour avec chaque bloc de predictions.
+    drift : DriftMonitor mis a jour avec chaque bloc (et ses residus si
+    l'entree contient Exam_Score).
+    Retourne un dict avec le nombre de lignes, la duree et le debit.
+    """
+    start = time.perf_counter()
+    rows = 0
+    header = True
+    writer = QuarantineWriter(quarantine) if quarantine is not None else None
+    try:
+        with open(output_path, 'w', newline='') as f:
+            chunks = iter_chunks(input_path, batch_size)
+            if writer is not None:
+                chunks = validate_chunks(chunks, writer)
+            for chunk, predictions in _predictions(chunks, model, preprocessor, workers):
+                pd.DataFrame({'row': chunk.index, PREDICTION_COLUMN: predictions}).to_csv(
+                    f, header=header, index=False)
+                header = False
+                if ranking is not None:
+                    ranking.update(chunk, predictions)
+                if drift is not None:
+                    drift.update(chunk, predictions)
+                rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    seconds = time.perf_counter() - start
+    stats = {'rows': rows, 'seconds': seconds,
+             'rows_per_second': rows / seconds if seconds else np.inf}
+    if writer is not None:
+        stats['quarantined'] = writer.rows
+    return stats
+
+
+def _print_alert(record):
+    print(f"Derive : {record['column']} (PSI {record['psi']:.3f}, KS {record['ks']:.3f}, "
+          f"{record['rows']} lignes)", file=sys.stderr)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scoring par lots des etudiants")
+    parser.add_argument('input', help="CSV au format StudentPerformanceFactors.csv")
+    parser.add_argument('output', help="CSV de sortie (row, Predicted_Exam_Score)")
+    parser.add_argument('--model', default=DEFAULT_MODEL, help="Modele joblib ou .splm")
+    add_preprocessor_arguments(parser)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--quarantine', default=None,
+                        help="CSV des lignes invalides (active la validation)")
+    parser.add_argument('--top-k', type=int, default=None,
+                        help="Nombre d'etudiants les plus a risque a classer")
+    parser.add_argument('--group-by', default=None,
+                        help="Colonne de regroupement du classement (ex. School_Type)")
+    parser.add_argument('--ranking', default=None,
+                        help="CSV du classement (defaut : <output>_ranking.csv)")
+    parser.add_argument('--drift-reference', default=None,
+                        help="Reference JSON de drift.py (active la surveillance de derive)")
+    parser.add_argument('--drift-report', default=None,
+                        help="CSV du rapport de derive (defaut : <output>_drift.csv)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    model = load_model(args.model)
+    preprocessor = load_preprocessor(model, args.preprocessor, args.train_data)
+    ranking = TopKAtRisk(args.top_k, args.group_by) if args.top_k else None
+    drift = None
+    if args.drift_reference is not None:
+        drift = DriftMonitor(DriftReference.load(args.drift_reference), callback=_print_alert)
+
+    stats = score_file(args.input, args.output, model, preprocessor,
+                       batch_size=args.batch_size, workers=args.workers,
+                       quarantine=args.quarantine, ranking=ranking, drift=drift)
+
+    print(f"{stats['rows']} lignes scorees en {stats['seconds']:.2f} s "
+          f"({stats['rows_per_second']:.0f} lignes/s)", file=sys.stderr)
+    if 'quarantined' in stats:
+        print(f"{stats['quarantined']} lignes en quarantaine : {args.quarantine}", file=sys.stderr)
+    if ranking is not None:
+        explainer = LinearExplainer.from_model(model, preprocessor)
+        ranking_path = args.ranking or os.path.splitext(args.output)[0] + '_ranking.csv'
+        ranking.to_frame(explainer).to_csv(ranking_path, index=False)
+        print(f"Classement des {args.top_k} etudiants les plus a risque : {ranking_path}",
+              file=sys.stderr)
+    if drift is not None:
+        drift_path = args.drift_report or os.path.splitext(args.output)[0] + '_drift.csv'
+        drift.report().to_csv(drift_path, index=False)
+        print(f"{len(drift.alerts())} colonnes en derive, rapport : {drift_path}", file=sys.stderr)
+    return stats
+
+
+if __name__ == "__main__":
+    main()
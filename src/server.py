@@ -0,0 +1,298 @@
+"""
+Service local de prediction a faible latence (systeme d'alerte precoce)
+
+Le modele et l'etat de preprocessing restent en memoire. Les requetes
+unitaires concurrentes sont regroupees en micro-lots (taille maximale et
+attente maximale configurables) avant un seul appel vectorise a predict.
+Avec --cache-size, un PredictionCache evite de repredire les etudiants
+deja vus (ses compteurs sont dans /metrics).
+
+Routes :
+    POST /predict   un etudiant (objet JSON) -> {"prediction": ...}
+    GET  /metrics   compteurs, latences p50/p99 et debit
+    GET  /health
+
+Exemple :
+    python src/server.py --port 8000 --max-batch-size 64 --max-wait-ms 2 --cache-size 100000
+"""
+
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from score import DEFAULT_MODEL, add_preprocessor_arguments, load_model, load_preprocessor, predict_batch
+from prediction_cache import DEFAULT_TTL, PredictionCache
+from validation import DEFAULT_RULES, REASON_COLUMN, validate
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 2.0
+
+# Nombre de latences conservees pour le calcul des percentiles
+LATENCY_WINDOW = 10_000
+
+
+class ServiceMetrics:
+    """Compteurs du service et fenetre glissante des latences"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+
+    def record_batch(self, latencies, errors=0):
+        with self._lock:
+            self.batches += 1
+            self.requests += len(latencies)
+            self.errors += errors
+            self._latencies.extend(latencies)
+
+    def snapshot(self):
+        """Etat courant des compteurs (latences en millisecondes)"""
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            requests, batches, errors = self.requests, self.batches, self.errors
+        uptime = time.monotonic() - self.started_at
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (0.0, 0.0)
+        return {
+            'requests': requests,
+            'batches': batches,
+            'errors': errors,
+            'mean_batch_size': requests / batches if batches else 0.0,
+            'latency_p50_ms': float(p50),
+            'latency_p99_ms': float(p99),
+            'throughput_rps': requests / uptime if uptime else 0.0,
+            'uptime_seconds': uptime
+        }
+
+
+class MicroBatcher:
+    """Regroupe les predictions unitaires en micro-lots
+
+    predict_fn recoit une liste d'enregistrements (dicts) et retourne une
+    prediction par enregistrement. Un lot part des qu'il contient
+    max_batch_size requetes ou que la plus ancienne a attendu max_wait_ms.
+    Si le lot echoue, chaque enregistrement est repredit seul : seules les
+    requetes fautives recoivent l'erreur. predict_fn peut aussi placer une
+    exception a la position d'un enregistrement refuse (ex. validation) :
+    elle est transmise a cette seule requete.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS, metrics=None):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = metrics or ServiceMetrics()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, record):
+        """Ajoute un enregistrement a la file ; retourne un Future"""
+        future = Future()
+        self._queue.put((record, future, time.monotonic()))
+        return future
+
+    def predict(self, record, timeout=None):
+        return self.submit(record).result(timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _next_batch(self, first):
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._next_batch(first)
+            records = [record for record, _, _ in batch]
+            try:
+                predictions = self.predict_fn(records)
+            except Exception as exc:
+                if len(batch) > 1:
+                    errors = self._predict_one_by_one(batch)
+                else:
+                    batch[0][1].set_exception(exc)
+                    errors = 1
+            else:
+                errors = sum(self._set_result(future, prediction)
+                             for (_, future, _), prediction in zip(batch, predictions))
+            now = time.monotonic()
+            self.metrics.record_batch([now - enqueued for _, _, enqueued in batch], errors)
+
+    def _predict_one_by_one(self, batch):
+        """Repli apres l'echec d'un lot ; retourne le nombre de requetes en erreur"""
+        errors = 0
+        for record, future, _ in batch:
+            try:
+                prediction = self.predict_fn([record])[0]
+            except Exception as exc:
+                future.set_exception(exc)
+                errors += 1
+            else:
+                errors += self._set_result(future, prediction)
+        return errors
+
+    @staticmethod
+    def _set_result(future, prediction):
+        """Transmet la prediction, ou l'exception placee a sa position ; 1 si erreur"""
+        if isinstance(prediction, Exception):
+            future.set_exception(prediction)
+            return 1
+        future.set_result(float(prediction))
+        return 0
+
+
+def model_predict_fn(model, preprocessor):
+    """Fonction de prediction d'un lot d'enregistrements pour le MicroBatcher
+
+    Le lot est valide en un seul appel vectorise (plages, modalites, types) ;
+    un enregistrement refuse recoit une ValueError avec ses motifs au lieu
+    d'une prediction, les autres sont predits normalement.
+    """
+    def predict(records):
+        valid, rejected = validate(pd.DataFrame.from_records(records))
+        results = [None] * len(records)
+        for position, reasons in zip(rejected.index, rejected[REASON_COLUMN]):
+            results[position] = ValueError(f"Valeurs invalides : {reasons}")
+        if len(valid):
+            for position, prediction in zip(valid.index, predict_batch(model, preprocessor, valid)):
+                results[position] = prediction
+        return results
+    return predict
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """Routes HTTP du service ; self.server.batcher porte le MicroBatcher"""
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, allow_nan=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            payload = self.server.batcher.metrics.snapshot()
+            if self.server.cache is not None:
+                payload['cache'] = self.server.cache.stats()
+            self._send_json(200, payload)
+        elif self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': 'route inconnue'})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send_json(404, {'error': 'route inconnue'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            record = json.loads(self.rfile.read(length))
+            if not isinstance(record, dict):
+                raise ValueError("le corps doit etre un objet JSON")
+            # Un champ manquant serait sinon impute en silence dans un lot
+            DEFAULT_RULES.check_columns(record)
+            prediction = self.server.batcher.predict(record)
+        except (ValueError, KeyError) as exc:
+            self._send_json(400, {'error': str(exc)})
+            return
+        except Exception as exc:
+            self._send_json(500, {'error': str(exc)})
+            return
+        if not math.isfinite(prediction):
+            # NaN / inf : ni une prediction exploitable ni du JSON valide
+            self._send_json(500, {'error': 'prediction non finie'})
+            return
+        self._send_json(200, {'prediction': prediction})
+
+    def log_message(self, format, *args):
+        # Pas de journal par requete : il domine le temps de reponse
+        pass
+
+
+class PredictionServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # File d'attente TCP assez longue pour les rafales de connexions courtes
+    request_queue_size = 128
+    cache = None
+
+
+def make_server(model, preprocessor, host='127.0.0.1', port=8000,
+                max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                cache_size=0, cache_ttl=DEFAULT_TTL):
+    """Cree le serveur HTTP (non demarre) avec son MicroBatcher
+
+    cache_size > 0 place un PredictionCache de cette taille devant le modele.
+    """
+    server = PredictionServer((host, port), PredictionHandler)
+    if cache_size:
+        model = server.cache = PredictionCache(model, cache_size, cache_ttl)
+    server.batcher = MicroBatcher(model_predict_fn(model, preprocessor),
+                                  max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Service local de prediction")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--model', default=DEFAULT_MODEL, help="Modele joblib ou .splm")
+    add_preprocessor_arguments(parser)
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS)
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help="Nombre de predictions en cache (0 = sans cache)")
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL,
+                        help="Duree de vie d'une prediction en cache (secondes)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    model = load_model(args.model)
+    preprocessor = load_preprocessor(model, args.preprocessor, args.train_data)
+    server = make_server(model, preprocessor, args.host, args.port,
+                         args.max_batch_size, args.max_wait_ms, args.cache_size, args.cache_ttl)
+    print(f"Service de prediction sur http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.close()
+
+
+if __name__ == "__main__":
+    main()
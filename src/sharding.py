@@ -0,0 +1,102 @@
+"""
+Preprocessing parallele de plusieurs fichiers CSV (un par ecole)
+
+1. Chaque fichier est compte en parallele, puis les comptages sont
+   fusionnes : les modes et categories sont globaux, identiques a ceux
+   obtenus sur la concatenation de tous les fichiers.
+2. Chaque fichier est ensuite encode en parallele avec cet etat commun,
+   donc avec exactement le meme schema de colonnes.
+"""
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import DEFAULT_CHUNKSIZE, Preprocessor, fit_preprocessor, iter_chunks
+from encoding import encode
+
+
+def resolve_paths(paths):
+    """Liste de fichiers a partir d'un motif glob ou d'une liste de chemins"""
+    if isinstance(paths, (str, os.PathLike)):
+        resolved = sorted(glob.glob(str(paths)))
+    else:
+        resolved = [str(path) for path in paths]
+    if not resolved:
+        raise ValueError(f"Aucun fichier CSV trouve pour {paths!r}")
+    return resolved
+
+
+def _fit_shard(path, chunksize, typed):
+    start = time.perf_counter()
+    preprocessor = fit_preprocessor(path, chunksize, typed)
+    return preprocessor, time.perf_counter() - start
+
+
+def _transform_shard(index, path, preprocessor, chunksize, typed, output_dir):
+    start = time.perf_counter()
+    chunks = iter_chunks(path, chunksize, typed)
+    if output_dir is None:
+        result = pd.concat([preprocessor.transform(chunk) for chunk in chunks],
+                           ignore_index=True)
+        rows = len(result)
+    else:
+        # Prefixe par la position : deux fichiers de meme nom ne s'ecrasent pas
+        stem = os.path.splitext(os.path.basename(path))[0]
+        result = os.path.join(output_dir, f'{index:05d}_{stem}.npy')
+        matrix = np.concatenate([encode(chunk, preprocessor) for chunk in chunks])
+        np.save(result, matrix)
+        rows = len(matrix)
+    return result, rows, time.perf_counter() - start
+
+
+def _map(function, n_jobs, *iterables):
+    if n_jobs == 1:
+        return list(map(function, *iterables))
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(function, *iterables))
+
+
+def preprocess_shards(paths, n_jobs=None, chunksize=DEFAULT_CHUNKSIZE, typed=False,
+                      output_dir=None):
+    """Preprocesse plusieurs fichiers CSV en parallele avec des statistiques globales
+
+    Sans output_dir, retourne (DataFrame concatene, timings) ; le DataFrame
+    est identique a preprocess_pipeline sur la concatenation des fichiers.
+    Avec output_dir, chaque fichier est ecrit en <position>_<nom>.npy
+    (matrice encodee, colonnes dans columns.json) et la liste des chemins
+    remplace le DataFrame. timings donne, par fichier, le nombre de lignes et les
+    durees des deux passes.
+    """
+    paths = resolve_paths(paths)
+    n = len(paths)
+
+    # 1. Comptages par fichier puis fusion en un etat global
+    fitted = _map(_fit_shard, n_jobs, paths, [chunksize] * n, [typed] * n)
+    preprocessor = Preprocessor()
+    for shard_preprocessor, _ in fitted:
+        preprocessor.merge(shard_preprocessor)
+
+    # 2. Encodage de chaque fichier avec l'etat global
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, 'columns.json'), 'w') as f:
+            json.dump(preprocessor.columns_, f)
+    transformed = _map(_transform_shard, n_jobs, range(n), paths, [preprocessor] * n,
+                       [chunksize] * n, [typed] * n, [output_dir] * n)
+
+    timings = pd.DataFrame({
+        'path': paths,
+        'rows': [rows for _, rows, _ in transformed],
+        'fit_seconds': [seconds for _, seconds in fitted],
+        'transform_seconds': [seconds for _, _, seconds in transformed]
+    })
+    results = [result for result, _, _ in transformed]
+    if output_dir is not None:
+        return results, timings
+    return pd.concat(results, ignore_index=True), timings
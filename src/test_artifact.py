@@ -0,0 +1,92 @@
+"""
+Tests Unitaires du format compact de modèle linéaire (.splm)
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import pickle
+import subprocess
+import shutil
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from artifact import export_linear, load_linear, read_header
+from preprocessing import Preprocessor
+from test_preprocessing import make_students
+from test_score import fit_model
+
+ARTIFACT_DIR = 'test_artifact_dir'
+
+
+class TestLinearArtifact:
+    """Tests pour l'export et le chargement .splm"""
+    
+    def setup_method(self):
+        os.makedirs(ARTIFACT_DIR, exist_ok=True)
+        self.path = os.path.join(ARTIFACT_DIR, 'model.splm')
+        self.model, self.preprocessor = fit_model(make_students())
+        export_linear(self.model, self.preprocessor, self.path)
+    
+    def teardown_method(self):
+        shutil.rmtree(ARTIFACT_DIR, ignore_errors=True)
+    
+    def test_predictions_match_model(self):
+        """Vérifie que le produit scalaire reproduit model.predict"""
+        X = self.preprocessor.transform(make_students().drop(columns='Exam_Score'))
+        
+        artifact = load_linear(self.path)
+        
+        np.testing.assert_allclose(artifact.predict(X.to_numpy(dtype=np.float64)),
+                                   self.model.predict(X))
+        assert isinstance(artifact.coef, np.memmap)
+    
+    def test_preprocessor_roundtrip(self):
+        """Vérifie que l'état de preprocessing stocké est complet"""
+        students = make_students()
+        
+        restored = load_linear(self.path).preprocessor()
+        
+        pd.testing.assert_frame_equal(restored.transform(students),
+                                      self.preprocessor.transform(students))
+    
+    def test_rejects_mismatched_features(self):
+        """Vérifie le refus d'un schéma de features différent"""
+        expected = list(reversed(self.preprocessor.feature_columns_))
+        
+        with pytest.raises(ValueError):
+            load_linear(self.path, expected_features=expected)
+    
+    def test_rejects_other_files(self):
+        """Vérifie le refus d'un fichier qui n'est pas un .splm"""
+        other = os.path.join(ARTIFACT_DIR, 'other.splm')
+        with open(other, 'wb') as f:
+            f.write(b'PK\x03\x04' + b'\0' * 60)
+        
+        with pytest.raises(ValueError):
+            read_header(other)
+    
+    def test_pickle_reopens_memory_map(self):
+        """Vérifie qu'un worker reçoit le chemin et non une copie des coefficients"""
+        artifact = load_linear(self.path)
+        
+        payload = pickle.dumps(artifact)
+        restored = pickle.loads(payload)
+        
+        assert len(payload) < os.path.getsize(self.path)
+        assert isinstance(restored.coef, np.memmap)
+        np.testing.assert_array_equal(restored.coef, artifact.coef)
+    
+    def test_scoring_does_not_import_sklearn(self):
+        """Vérifie que le chargement et le scoring n'importent pas scikit-learn"""
+        code = ("import sys, numpy as np; from artifact import load_linear; "
+                f"a = load_linear({os.path.abspath(self.path)!r}); a.predict(np.zeros(len(a.coef))); "
+                "print('sklearn' in sys.modules)")
+        src_dir = os.path.join(os.path.dirname(__file__), '..', 'src')
+        
+        output = subprocess.run([sys.executable, '-c', code], cwd=src_dir,
+                                capture_output=True, text=True, check=True)
+        
+        assert output.stdout.strip() == 'False'
@@ -0,0 +1,84 @@
+"""
+Tests Unitaires du cache disque des features preprocessees
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import mmap
+import shutil
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cache
+from cache import preprocess_cached, cache_key
+from preprocessing import preprocess_pipeline
+from test_preprocessing import make_students
+
+CACHE_DIR = 'test_cache_dir'
+
+
+class TestPreprocessCached:
+    """Tests pour la fonction preprocess_cached"""
+    
+    def setup_method(self):
+        make_students().to_csv('test_cache.csv', index=False)
+    
+    def teardown_method(self):
+        os.remove('test_cache.csv')
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    
+    def test_cached_matches_pipeline(self):
+        """Vérifie que le cache renvoie les valeurs de preprocess_pipeline"""
+        expected = preprocess_pipeline('test_cache.csv').astype(np.float64)
+        
+        cold = preprocess_cached('test_cache.csv', cache_dir=CACHE_DIR)
+        warm = preprocess_cached('test_cache.csv', cache_dir=CACHE_DIR)
+        
+        pd.testing.assert_frame_equal(cold, expected)
+        pd.testing.assert_frame_equal(warm, expected)
+    
+    def test_warm_load_is_memory_mapped(self):
+        """Vérifie que le chargement à chaud ne recopie pas la matrice"""
+        preprocess_cached('test_cache.csv', cache_dir=CACHE_DIR)
+        
+        warm = preprocess_cached('test_cache.csv', cache_dir=CACHE_DIR)
+        
+        base = warm['Hours_Studied'].to_numpy()
+        while base is not None and not isinstance(base, (np.memmap, mmap.mmap)):
+            base = getattr(base, 'base', None)
+        assert base is not None, "Les données doivent venir du memory-map"
+    
+    def test_key_changes_with_data(self):
+        """Vérifie que la modification du CSV invalide la clé"""
+        key = cache_key('test_cache.csv')
+        
+        modified = make_students()
+        modified.loc[0, 'Hours_Studied'] = 11
+        modified.to_csv('test_cache.csv', index=False)
+        
+        assert cache_key('test_cache.csv') != key
+    
+    def test_key_changes_with_pipeline_version(self, monkeypatch):
+        """Vérifie que la modification du pipeline invalide la clé"""
+        key = cache_key('test_cache.csv')
+        
+        monkeypatch.setattr(cache, 'pipeline_version', lambda: 'autre-version')
+        
+        assert cache_key('test_cache.csv') != key
+    
+    def test_eviction_respects_max_bytes(self):
+        """Vérifie que les entrées anciennes sont supprimées"""
+        preprocess_cached('test_cache.csv', cache_dir=CACHE_DIR)
+        first = {name for name in os.listdir(CACHE_DIR) if name.endswith('.npy')}
+        
+        other = make_students()
+        other.loc[0, 'Hours_Studied'] = 11
+        other.to_csv('test_cache.csv', index=False)
+        preprocess_cached('test_cache.csv', cache_dir=CACHE_DIR, max_bytes=1)
+        
+        remaining = {name for name in os.listdir(CACHE_DIR) if name.endswith('.npy')}
+        assert len(remaining) == 1
+        assert not remaining & first
@@ -0,0 +1,87 @@
+"""
+Tests Unitaires de la comparaison de modèles en parallèle
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import shutil
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+from sklearn.tree import DecisionTreeRegressor
+
+from compare import compare_models, save_metrics, METRIC_COLUMNS
+
+CACHE_DIR = 'test_compare_cache'
+
+
+def make_split(n=200, seed=0):
+    """Split train/test synthétique avec noms de colonnes"""
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 4)), columns=['a', 'b', 'c', 'd'])
+    y = pd.Series(X.to_numpy() @ [1.0, -2.0, 0.5, 0.0] + rng.normal(size=n))
+    return X.iloc[:150], X.iloc[150:], y.iloc[:150], y.iloc[150:]
+
+
+def candidate_models():
+    return {
+        'Linear Regression': LinearRegression(),
+        'Ridge Regression': Ridge(random_state=42),
+        'Decision Tree': DecisionTreeRegressor(max_depth=3, random_state=42)
+    }
+
+
+class TestCompareModels:
+    """Tests pour la fonction compare_models"""
+    
+    def teardown_method(self):
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    
+    def test_metrics_match_sklearn(self):
+        """Vérifie les métriques calculées en parallèle"""
+        X_train, X_test, y_train, y_test = make_split()
+        
+        results, fitted = compare_models(X_train, X_test, y_train, y_test,
+                                         models=candidate_models(), n_jobs=2,
+                                         cache_dir=CACHE_DIR)
+        
+        assert list(results.index) == list(candidate_models())
+        for name, model in fitted.items():
+            y_pred = model.predict(X_test)
+            assert results.loc[name, 'test_rmse'] == pytest.approx(
+                np.sqrt(mean_squared_error(y_test, y_pred)))
+            assert results.loc[name, 'test_mae'] == pytest.approx(mean_absolute_error(y_test, y_pred))
+            assert results.loc[name, 'test_r2'] == pytest.approx(r2_score(y_test, y_pred))
+        assert list(fitted['Ridge Regression'].feature_names_in_) == ['a', 'b', 'c', 'd']
+    
+    def test_second_run_uses_cache(self):
+        """Vérifie que les modèles déjà entraînés sont relus du cache"""
+        split = make_split()
+        first, _ = compare_models(*split, models=candidate_models(), n_jobs=1,
+                                  cache_dir=CACHE_DIR)
+        
+        models = candidate_models()
+        models['Ridge Regression'] = Ridge(alpha=10, random_state=42)
+        second, _ = compare_models(*split, models=models, n_jobs=1, cache_dir=CACHE_DIR)
+        
+        assert not first['cached'].any()
+        assert second['cached'].tolist() == [True, False, True]
+        pd.testing.assert_series_equal(first.loc['Linear Regression', METRIC_COLUMNS],
+                                       second.loc['Linear Regression', METRIC_COLUMNS])
+    
+    def test_save_metrics_format(self):
+        """Vérifie le format de model_metrics.csv"""
+        results, _ = compare_models(*make_split(), models=candidate_models(), n_jobs=1,
+                                    cache_dir=CACHE_DIR)
+        path = os.path.join(CACHE_DIR, 'model_metrics.csv')
+        
+        save_metrics(results, path)
+        
+        saved = pd.read_csv(path)
+        assert list(saved.columns[:7]) == ['model_name'] + METRIC_COLUMNS
+        assert 'fit_seconds' in saved.columns and 'predict_seconds' in saved.columns
@@ -0,0 +1,182 @@
+"""
+Tests Unitaires de la surveillance de derive
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import joblib
+import shutil
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from drift import (Histogram, DriftReference, DriftMonitor, psi, ks,
+                   RESIDUAL, OK, ALERT)
+from score import main
+from test_preprocessing import make_students
+from test_score import fit_model
+
+DRIFT_DIR = 'test_drift_dir'
+
+
+def students(n, seed=0, attendance=(60, 101)):
+    """Jeu d'étudiants aléatoires au schéma du CSV"""
+    rng = np.random.default_rng(seed)
+    base = make_students().dropna()
+    df = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+    df['Attendance'] = rng.integers(*attendance, n)
+    df['Hours_Studied'] = rng.integers(1, 45, n)
+    return df
+
+
+class TestHistogram:
+    """Tests pour les comptes par seau"""
+
+    def test_numeric_buckets(self):
+        """Vérifie les seaux numériques et le seau des valeurs vides"""
+        histogram = Histogram(edges=[10, 20])
+        counts = histogram.counts(pd.Series([5, 10, 15, 25, np.nan, 'abc']))
+
+        assert counts.tolist() == [1, 2, 1, 2]
+
+    def test_categorical_buckets(self):
+        """Vérifie les modalités, le seau inconnu et le seau vide"""
+        histogram = Histogram(levels=['Low', 'Medium', 'High'])
+        counts = histogram.counts(pd.Series(['Low', 'High', 'High', 'Huge', None]))
+
+        assert counts.tolist() == [1, 0, 2, 1, 1]
+
+    def test_categorical_dtype(self):
+        """Vérifie les mêmes comptes sur une colonne category"""
+        histogram = Histogram(levels=['Low', 'Medium', 'High'])
+        values = pd.Series(['Low', 'High', 'High', 'Huge', None])
+
+        np.testing.assert_array_equal(histogram.counts(values.astype('category')),
+                                      histogram.counts(values))
+
+    def test_quantile_edges(self):
+        """Vérifie des seaux de population comparable"""
+        histogram = Histogram.quantiles(np.arange(1000), n_bins=4)
+        counts = histogram.counts(np.arange(1000))
+
+        assert len(histogram.edges) == 3
+        assert counts[:-1].min() >= 249
+
+
+class TestStatistics:
+    """Tests pour le PSI et le KS"""
+
+    def test_identical_distributions(self):
+        """Vérifie un PSI et un KS nuls pour des distributions identiques"""
+        counts = np.array([10, 20, 30, 0])
+
+        assert psi(counts, 2 * counts) == pytest.approx(0)
+        assert ks(counts, 2 * counts) == pytest.approx(0)
+
+    def test_shifted_distribution(self):
+        """Vérifie un PSI et un KS élevés pour une distribution décalée"""
+        expected, actual = np.array([50, 50, 0, 0]), np.array([0, 50, 50, 0])
+
+        assert psi(expected, actual) > 1
+        assert ks(expected, actual) == pytest.approx(0.5)
+
+
+class TestDriftMonitor:
+    """Tests pour la surveillance incrémentale"""
+
+    def setup_method(self):
+        train = students(2000)
+        self.model, self.preprocessor = fit_model(train)
+        self.predict = lambda chunk: self.model.predict(
+            self.preprocessor.transform(chunk.drop(columns='Exam_Score')))
+        chunks = [train.iloc[i:i + 500] for i in range(0, len(train), 500)]
+        self.reference = DriftReference.fit(chunks, self.predict)
+
+    def test_reference_round_trip(self):
+        """Vérifie la sauvegarde JSON de la référence"""
+        os.makedirs(DRIFT_DIR, exist_ok=True)
+        try:
+            path = os.path.join(DRIFT_DIR, 'reference.json')
+            self.reference.save(path)
+            loaded = DriftReference.load(path)
+        finally:
+            shutil.rmtree(DRIFT_DIR, ignore_errors=True)
+
+        assert set(loaded.histograms) == set(self.reference.histograms)
+        for col, counts in self.reference.counts.items():
+            np.testing.assert_array_equal(loaded.counts[col], counts)
+        assert self.reference.counts['Attendance'].sum() == 2000
+        assert RESIDUAL in loaded.histograms
+
+    def test_same_distribution_is_ok(self):
+        """Vérifie l'absence d'alerte sur des lots de même distribution"""
+        monitor = DriftMonitor(self.reference)
+        batch = students(3000, seed=1)
+        for start in range(0, len(batch), 1000):
+            chunk = batch.iloc[start:start + 1000]
+            monitor.update(chunk, self.predict(chunk))
+
+        report = monitor.report()
+        assert report['rows'].eq(3000).all()
+        assert RESIDUAL in report['column'].tolist()
+        assert len(monitor.alerts()) == 0
+
+    def test_shift_raises_alert_once(self):
+        """Vérifie qu'une colonne décalée déclenche une seule alerte"""
+        alerts = []
+        monitor = DriftMonitor(self.reference, callback=alerts.append)
+        batch = students(3000, seed=1, attendance=(60, 75))
+        for start in range(0, len(batch), 1000):
+            monitor.update(batch.iloc[start:start + 1000].drop(columns='Exam_Score'))
+
+        assert [record['column'] for record in alerts] == ['Attendance']
+        assert monitor.alerts()['column'].tolist() == ['Attendance']
+
+    def test_min_rows(self):
+        """Vérifie qu'aucune alerte n'est levée sur trop peu de lignes"""
+        monitor = DriftMonitor(self.reference, min_rows=1000)
+        monitor.update(students(100, attendance=(60, 65)))
+
+        assert monitor.report()['status'].eq(OK).all()
+
+    def test_reset(self):
+        """Vérifie qu'une nouvelle fenêtre repart de zéro"""
+        monitor = DriftMonitor(self.reference)
+        monitor.update(students(100))
+        monitor.reset()
+
+        assert len(monitor.report()) == 0
+
+
+class TestScoreDrift:
+    """Tests pour l'option --drift-reference du scoring par lots"""
+
+    def setup_method(self):
+        os.makedirs(DRIFT_DIR, exist_ok=True)
+        train = students(2000)
+        model, preprocessor = fit_model(train)
+        self.train_path = os.path.join(DRIFT_DIR, 'train.csv')
+        self.input_path = os.path.join(DRIFT_DIR, 'input.csv')
+        self.output_path = os.path.join(DRIFT_DIR, 'output.csv')
+        self.model_path = os.path.join(DRIFT_DIR, 'model.pkl')
+        self.reference_path = os.path.join(DRIFT_DIR, 'reference.json')
+        train.to_csv(self.train_path, index=False)
+        students(2000, seed=1, attendance=(60, 75)).drop(columns='Exam_Score').to_csv(
+            self.input_path, index=False)
+        joblib.dump(model, self.model_path)
+        DriftReference.fit([train]).save(self.reference_path)
+
+    def teardown_method(self):
+        shutil.rmtree(DRIFT_DIR, ignore_errors=True)
+
+    def test_cli_writes_drift_report(self):
+        """Vérifie le rapport de dérive écrit par la CLI"""
+        main([self.input_path, self.output_path, '--model', self.model_path,
+              '--train-data', self.train_path, '--drift-reference', self.reference_path])
+
+        report = pd.read_csv(os.path.join(DRIFT_DIR, 'output_drift.csv'))
+        status = dict(zip(report['column'], report['status']))
+        assert status['Attendance'] == ALERT
+        assert status['Previous_Scores'] == OK
@@ -0,0 +1,75 @@
+"""
+Tests Unitaires du moteur d'encodage vectorise
+Vérifie que encode() produit exactement les mêmes valeurs que
+Preprocessor.transform, quel que soit le type des colonnes en entrée.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preprocessing import Preprocessor, load_data
+from encoding import encode
+from test_preprocessing import make_students
+
+
+class TestEncode:
+    """Tests pour la fonction encode"""
+    
+    def test_encode_matches_transform(self):
+        """Vérifie l'égalité numérique avec Preprocessor.transform"""
+        df = make_students()
+        preprocessor = Preprocessor().fit(df)
+        
+        expected = preprocessor.transform(df).astype(np.float64)
+        result = encode(df, preprocessor, as_frame=True)
+        
+        pd.testing.assert_frame_equal(result, expected)
+    
+    def test_encode_returns_ndarray(self):
+        """Vérifie le retour par défaut sous forme de tableau NumPy"""
+        df = make_students()
+        preprocessor = Preprocessor().fit(df)
+        
+        result = encode(df, preprocessor)
+        
+        assert isinstance(result, np.ndarray)
+        assert result.shape == (len(df), len(preprocessor.columns_))
+    
+    def test_encode_unknown_label_like_map(self):
+        """Vérifie qu'une modalité inconnue devient NaN comme avec Series.map"""
+        df = make_students()
+        preprocessor = Preprocessor().fit(df)
+        df.loc[0, 'Motivation_Level'] = 'Very High'
+        
+        expected = preprocessor.transform(df).astype(np.float64)
+        result = encode(df, preprocessor, as_frame=True)
+        
+        assert np.isnan(result.loc[0, 'Motivation_Level'])
+        pd.testing.assert_frame_equal(result, expected)
+    
+    def test_encode_without_target(self):
+        """Vérifie l'encodage d'un lot à scorer sans Exam_Score"""
+        df = make_students()
+        preprocessor = Preprocessor().fit(df)
+        batch = df.drop(columns='Exam_Score')
+        
+        result = encode(batch, preprocessor, as_frame=True)
+        
+        assert list(result.columns) == preprocessor.feature_columns_
+    
+    def test_encode_typed_input(self):
+        """Vérifie l'encodage de colonnes chargées en dtype category"""
+        test_file = 'test_encoding.csv'
+        make_students().to_csv(test_file, index=False)
+        df = load_data(test_file)
+        typed = load_data(test_file, typed=True)
+        preprocessor = Preprocessor().fit(df)
+        
+        np.testing.assert_array_equal(encode(typed, preprocessor), encode(df, preprocessor))
+        
+        os.remove(test_file)
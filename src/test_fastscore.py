@@ -0,0 +1,78 @@
+"""
+Tests Unitaires du scoring à froid en Python pur
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import json
+import math
+import subprocess
+import shutil
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from artifact import export_linear
+from fastscore import FastModel
+from test_preprocessing import make_students
+from test_score import fit_model
+
+FAST_DIR = 'test_fastscore_dir'
+SRC_DIR = os.path.abspath(os.path.dirname(__file__))
+
+
+def records(df):
+    """Lignes d'un DataFrame en dicts JSON (NaN -> None)"""
+    return json.loads(df.to_json(orient='records'))
+
+
+class TestFastModel:
+    """Tests pour le scoring sans NumPy ni pandas"""
+
+    def setup_method(self):
+        os.makedirs(FAST_DIR, exist_ok=True)
+        self.path = os.path.join(FAST_DIR, 'model.splm')
+        self.students = make_students().drop(columns='Exam_Score')
+        self.model, self.preprocessor = fit_model(make_students())
+        export_linear(self.model, self.preprocessor, self.path)
+
+    def teardown_method(self):
+        shutil.rmtree(FAST_DIR, ignore_errors=True)
+
+    def test_matches_model_predict(self):
+        """Vérifie l'égalité avec le modèle, valeurs manquantes comprises"""
+        expected = self.model.predict(self.preprocessor.transform(self.students))
+        model = FastModel(self.path)
+
+        fast = [model.predict_one(record) for record in records(self.students)]
+
+        np.testing.assert_allclose(fast, expected)
+
+    def test_unknown_ordinal_is_nan(self):
+        """Vérifie qu'une modalité ordinale inconnue donne nan, comme transform_one"""
+        record = records(self.students)[0]
+        record['Motivation_Level'] = 'Extreme'
+
+        assert math.isnan(FastModel(self.path).predict_one(record))
+
+    def test_no_heavy_imports(self):
+        """Vérifie que le scoring n'importe ni NumPy ni pandas"""
+        code = (f"import sys; sys.path.insert(0, {SRC_DIR!r}); import fastscore; "
+                f"fastscore.FastModel({os.path.abspath(self.path)!r}); "
+                "print(sorted({'numpy', 'pandas', 'sklearn'} & set(sys.modules)))")
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                                text=True, check=True).stdout
+
+        assert output.strip() == '[]'
+
+    def test_cli_reads_json_lines(self):
+        """Vérifie la CLI sur un JSON par ligne en entrée standard"""
+        lines = '\n'.join(json.dumps(record) for record in records(self.students))
+        output = subprocess.run([sys.executable, os.path.join(SRC_DIR, 'fastscore.py'),
+                                 os.path.abspath(self.path)], input=lines,
+                                capture_output=True, text=True, check=True).stdout
+
+        expected = self.model.predict(self.preprocessor.transform(self.students))
+        np.testing.assert_allclose([float(line) for line in output.split()], expected)
@@ -0,0 +1,92 @@
+"""
+Tests Unitaires de l'instrumentation des étapes du pipeline
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from instrumentation import StageMetrics, stage
+from preprocessing import preprocess_pipeline, preprocess_chunks
+from test_preprocessing import make_students
+
+PIPELINE_STAGES = ['chargement', 'apprentissage', 'outliers', 'remplissage',
+                   'encodage_ordinal', 'one_hot']
+
+
+class TestStageMetrics:
+    """Tests pour la classe StageMetrics"""
+    
+    def setup_method(self):
+        make_students().to_csv('test_instrumentation.csv', index=False)
+    
+    def teardown_method(self):
+        os.remove('test_instrumentation.csv')
+    
+    def test_pipeline_records_each_stage(self):
+        """Vérifie qu'une mesure est enregistrée par étape nommée"""
+        metrics = StageMetrics()
+        
+        preprocess_pipeline('test_instrumentation.csv', metrics=metrics)
+        
+        assert [r['stage'] for r in metrics.records] == PIPELINE_STAGES
+        assert all(r['rows'] == 4 for r in metrics.records)
+        assert all(r['seconds'] >= 0 for r in metrics.records)
+    
+    def test_results_unchanged_with_metrics(self):
+        """Vérifie que l'instrumentation ne modifie pas la sortie"""
+        expected = preprocess_pipeline('test_instrumentation.csv')
+        
+        result = preprocess_pipeline('test_instrumentation.csv', metrics=StageMetrics())
+        
+        pd.testing.assert_frame_equal(result, expected)
+    
+    def test_callback_and_memory(self):
+        """Vérifie le callback et les mesures mémoire"""
+        received = []
+        metrics = StageMetrics(callback=received.append, trace_memory=True)
+        
+        preprocess_pipeline('test_instrumentation.csv', metrics=metrics)
+        
+        assert received == metrics.records
+        assert all('peak_bytes' in r and r['peak_bytes'] >= 0 for r in received)
+    
+    def test_nested_stage_keeps_parent_peak(self):
+        """Vérifie qu'une étape imbriquée n'efface pas le pic mémoire de son parent"""
+        metrics = StageMetrics(trace_memory=True)
+        
+        with metrics.stage('chargement'):
+            buffer = bytearray(10_000_000)
+            del buffer
+            with metrics.stage('validation'):
+                bytearray(1000)
+        
+        inner, outer = metrics.records
+        assert inner['stage'] == 'validation'
+        assert inner['peak_bytes'] < 1_000_000
+        assert outer['peak_bytes'] >= 10_000_000
+        assert outer['allocated_bytes'] < 1_000_000
+    
+    def test_streaming_totals(self):
+        """Vérifie les cumuls par étape en mode streaming"""
+        metrics = StageMetrics()
+        
+        list(preprocess_chunks('test_instrumentation.csv', chunksize=3, metrics=metrics))
+        
+        totals = metrics.totals()
+        assert totals['one_hot']['calls'] == 2
+        assert totals['one_hot']['rows'] == 4
+        assert totals['chargement']['rows'] == 4
+    
+    def test_disabled_stage_is_noop(self):
+        """Vérifie le contexte vide quand l'instrumentation est désactivée"""
+        with stage(None, 'outliers', 10) as record:
+            record['rows'] = 5
+        
+        with stage(None, 'autre') as other:
+            assert other == {}
+        assert record is not other
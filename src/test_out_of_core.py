@@ -0,0 +1,104 @@
+"""
+Tests Unitaires de l'entrainement hors memoire
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import shutil
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.linear_model import SGDRegressor
+
+from out_of_core import hash_split, StreamingMetrics, train_out_of_core
+from compare import METRIC_COLUMNS, regression_metrics
+from preprocessing import fit_preprocessor
+from score import predict_batch
+from test_drift import students
+
+OOC_DIR = 'test_ooc_dir'
+
+
+class TestHashSplit:
+    """Tests pour la répartition déterministe entraînement / test"""
+
+    def test_deterministic_and_chunk_independent(self):
+        """Vérifie qu'une ligne reste du même côté quel que soit le découpage"""
+        keys = np.arange(10_000)
+        full = hash_split(keys)
+        parts = np.concatenate([hash_split(keys[i:i + 333]) for i in range(0, len(keys), 333)])
+
+        np.testing.assert_array_equal(full, parts)
+        np.testing.assert_array_equal(full, hash_split(keys))
+
+    def test_test_size(self):
+        """Vérifie la proportion de lignes de test"""
+        mask = hash_split(np.arange(100_000), test_size=0.2)
+
+        assert mask.mean() == pytest.approx(0.2, abs=0.01)
+
+    def test_seed(self):
+        """Vérifie qu'une autre graine donne une autre répartition"""
+        keys = np.arange(1000)
+
+        assert (hash_split(keys, seed=1) != hash_split(keys, seed=2)).any()
+
+
+class TestStreamingMetrics:
+    """Tests pour les métriques accumulées par blocs"""
+
+    def test_matches_full_metrics(self):
+        """Vérifie RMSE, MAE et R² contre un calcul sur toutes les lignes"""
+        rng = np.random.default_rng(0)
+        y_true = rng.normal(67, 4, 1000)
+        y_pred = y_true + rng.normal(0, 2, 1000)
+
+        metrics = StreamingMetrics()
+        for start in range(0, 1000, 137):
+            metrics.update(y_true[start:start + 137], y_pred[start:start + 137])
+
+        np.testing.assert_allclose(metrics.result(), regression_metrics(y_true, y_pred))
+
+
+class TestTrainOutOfCore:
+    """Tests pour l'entraînement par partial_fit"""
+
+    def setup_method(self):
+        os.makedirs(OOC_DIR, exist_ok=True)
+        rng = np.random.default_rng(0)
+        df = students(3000)
+        df['Exam_Score'] = (40 + 0.2 * df['Attendance'] + 0.3 * df['Hours_Studied']
+                            + rng.normal(0, 1, len(df))).round()
+        self.path = os.path.join(OOC_DIR, 'students.csv')
+        df.to_csv(self.path, index=False)
+
+    def teardown_method(self):
+        shutil.rmtree(OOC_DIR, ignore_errors=True)
+
+    def test_metrics_columns_and_quality(self):
+        """Vérifie les colonnes de model_metrics.csv et un R² correct"""
+        results, fitted = train_out_of_core(self.path, chunksize=500, epochs=3)
+
+        assert list(results.columns) == METRIC_COLUMNS
+        assert set(fitted) == set(results.index)
+        assert (results['test_r2'] > 0.8).all()
+
+    def test_chunksize_invariant_split(self):
+        """Vérifie que les métriques dépendent peu de la taille des blocs"""
+        models = lambda: {'SGD': SGDRegressor(random_state=0)}
+        small, _ = train_out_of_core(self.path, models(), chunksize=300, epochs=3)
+        large, _ = train_out_of_core(self.path, models(), chunksize=3000, epochs=3)
+
+        np.testing.assert_allclose(small['test_rmse'], large['test_rmse'], rtol=0.05)
+
+    def test_pipeline_scores_with_score_module(self):
+        """Vérifie que le modèle entraîné s'utilise tel quel pour le scoring"""
+        _, fitted = train_out_of_core(self.path, chunksize=1000, epochs=2)
+        raw = pd.read_csv(self.path)
+        predictions = predict_batch(fitted['SGD Regression'], fit_preprocessor(self.path), raw)
+
+        assert len(predictions) == len(raw)
+        assert np.abs(predictions - raw['Exam_Score']).mean() < 2
@@ -0,0 +1,167 @@
+"""
+Tests Unitaires du cache de prédictions
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import json
+import threading
+import urllib.request
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from prediction_cache import PredictionCache, model_version
+from server import make_server
+from score import predict_batch
+from test_preprocessing import make_students
+from test_score import fit_model
+
+
+class CountingModel:
+    """Modèle linéaire qui compte les lignes prédites"""
+
+    def __init__(self, weights, intercept=0.0):
+        self.coef = np.asarray(weights, dtype=np.float64)
+        self.intercept = intercept
+        self.rows = []
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        self.rows.append(len(X))
+        return X @ self.coef + self.intercept
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPredictionCache:
+    """Tests pour la déduplication, le LRU, le TTL et l'invalidation"""
+
+    def setup_method(self):
+        self.model = CountingModel([1.0, 10.0])
+        self.clock = FakeClock()
+        self.cache = PredictionCache(self.model, max_entries=3, ttl=60, clock=self.clock)
+
+    def test_batch_deduplication(self):
+        """Vérifie qu'une ligne répétée dans un lot n'est prédite qu'une fois"""
+        X = np.array([[1, 2], [3, 4], [1, 2], [1, 2]])
+
+        result = self.cache.predict(X)
+
+        np.testing.assert_allclose(result, [21, 43, 21, 21])
+        assert self.model.rows == [2]
+        assert self.cache.stats()['duplicates'] == 2
+
+    def test_hits_skip_model(self):
+        """Vérifie que les lignes déjà vues ne rappellent pas le modèle"""
+        self.cache.predict(np.array([[1, 2], [3, 4]]))
+        result = self.cache.predict(np.array([[3, 4], [5, 6], [1, 2]]))
+
+        np.testing.assert_allclose(result, [43, 65, 21])
+        assert self.model.rows == [2, 1]
+        stats = self.cache.stats()
+        assert (stats['hits'], stats['misses']) == (2, 3)
+        assert stats['hit_rate'] == pytest.approx(0.4)
+
+    def test_lru_eviction(self):
+        """Vérifie l'éviction de l'entrée la moins récemment utilisée"""
+        self.cache.predict(np.array([[1, 0], [2, 0], [3, 0]]))
+        self.cache.predict(np.array([[1, 0]]))
+        self.cache.predict(np.array([[4, 0]]))
+        self.cache.predict(np.array([[1, 0], [2, 0]]))
+
+        assert self.model.rows == [3, 1, 1]
+        assert self.cache.stats()['evictions'] >= 1
+        assert self.cache.stats()['entries'] == 3
+
+    def test_ttl_expiry(self):
+        """Vérifie qu'une entrée expirée est reprédite"""
+        self.cache.predict(np.array([[1, 2]]))
+        self.clock.now = 61
+        self.cache.predict(np.array([[1, 2]]))
+
+        assert self.model.rows == [1, 1]
+        assert self.cache.stats()['expired'] == 1
+
+    def test_model_change_invalidates(self):
+        """Vérifie que changer de modèle vide le cache"""
+        self.cache.predict(np.array([[1, 2]]))
+        new_model = CountingModel([2.0, 0.0])
+        self.cache.set_model(new_model)
+
+        result = self.cache.predict(np.array([[1, 2]]))
+
+        assert result[0] == pytest.approx(2)
+        assert self.cache.stats()['invalidations'] == 1
+        assert self.cache.version == model_version(new_model)
+
+    def test_model_change_during_predict(self):
+        """Vérifie qu'une prédiction de l'ancien modèle n'entre pas dans le cache"""
+        cache = self.cache
+
+        class SwappingModel(CountingModel):
+            def predict(self, X):
+                # Le modèle est remplacé pendant la prédiction
+                cache.set_model(CountingModel([2.0, 0.0]), version='v2')
+                return super().predict(X)
+
+        cache.set_model(SwappingModel([1.0, 10.0]), version='v1')
+        assert cache.predict(np.array([[1, 2]]))[0] == pytest.approx(21)
+
+        assert cache.stats()['entries'] == 0
+        assert cache.stats()['model_version'] == 'v2'
+        assert cache.predict(np.array([[1, 2]]))[0] == pytest.approx(2)
+
+    def test_same_model_keeps_entries(self):
+        """Vérifie qu'un modèle identique ne vide pas le cache"""
+        self.cache.predict(np.array([[1, 2]]))
+        self.cache.set_model(CountingModel([1.0, 10.0]))
+
+        assert self.cache.stats()['entries'] == 1
+        assert self.cache.stats()['invalidations'] == 0
+
+    def test_drop_in_for_predict_batch(self):
+        """Vérifie que le cache remplace le modèle dans predict_batch"""
+        students = make_students()
+        model, preprocessor = fit_model(students)
+        cache = PredictionCache(model)
+        chunk = pd.concat([students.drop(columns='Exam_Score')] * 3, ignore_index=True)
+
+        np.testing.assert_allclose(predict_batch(cache, preprocessor, chunk),
+                                   predict_batch(model, preprocessor, chunk))
+        assert cache.stats()['misses'] == 4
+
+
+class TestServerCache:
+    """Tests du cache dans le service de prédiction"""
+
+    def test_metrics_expose_cache(self):
+        """Vérifie les compteurs du cache dans /metrics"""
+        students = make_students()
+        model, preprocessor = fit_model(students)
+        server = make_server(model, preprocessor, port=0, max_wait_ms=1, cache_size=100)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_port}"
+        record = students.drop(columns='Exam_Score').iloc[0].to_dict()
+        try:
+            for _ in range(3):
+                request = urllib.request.Request(url + '/predict', data=json.dumps(record).encode())
+                urllib.request.urlopen(request).close()
+            with urllib.request.urlopen(url + '/metrics') as response:
+                metrics = json.loads(response.read())
+        finally:
+            server.shutdown()
+            server.server_close()
+            server.batcher.close()
+
+        assert metrics['cache']['misses'] == 1
+        assert metrics['cache']['hits'] == 2
@@ -16,10 +16,39 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 from preprocessing import (
     load_data,
     handle_outliers,
-    preprocess_pipeline
+    preprocess_pipeline,
+    preprocess_chunks,
+    fit_preprocessor,
+    Preprocessor
 )
 
 
+def make_students():
+    """Petit jeu de donnees brut au format StudentPerformanceFactors.csv"""
+    return pd.DataFrame({
+        'Hours_Studied': [10, 15, 20, 25],
+        'Attendance': [80, 90, 95, 85],
+        'Parental_Involvement': ['Low', 'Medium', 'High', 'Low'],
+        'Access_to_Resources': ['Low', 'Medium', 'High', 'Medium'],
+        'Motivation_Level': ['Low', 'Medium', 'High', 'Low'],
+        'Tutoring_Sessions': [0, 1, 2, 1],
+        'Family_Income': ['Low', 'Medium', 'High', 'Low'],
+        'Teacher_Quality': ['Low', 'High', None, 'High'],
+        'School_Type': ['Public', 'Private', 'Public', 'Private'],
+        'Peer_Influence': ['Positive', 'Neutral', 'Negative', 'Positive'],
+        'Physical_Activity': [3, 4, 5, 3],
+        'Parental_Education_Level': ['College', None, 'Postgraduate', 'College'],
+        'Distance_from_Home': ['Near', 'Moderate', None, 'Far'],
+        'Sleep_Hours': [7, 8, 6, 7],
+        'Previous_Scores': [60, 70, 80, 65],
+        'Extracurricular_Activities': ['Yes', 'No', 'Yes', 'No'],
+        'Internet_Access': ['Yes', 'Yes', 'No', 'Yes'],
+        'Learning_Disabilities': ['No', 'No', 'Yes', 'No'],
+        'Gender': ['Male', 'Female', 'Male', 'Female'],
+        'Exam_Score': [60, 70, 101, 75]
+    })
+
+
 class TestLoadData:
     """Tests pour la fonction load_data"""
     
@@ -426,6 +455,199 @@ class TestDataIntegrity:
         os.remove(test_file)
 
 
+
+class TestPreprocessor:
+    """Tests pour le preprocessing appris (fit / transform / transform_one)"""
+    
+    def test_fit_transform_matches_pipeline(self):
+        """Vérifie que fit puis transform reproduit preprocess_pipeline"""
+        test_data = make_students()
+        test_file = 'test_preprocessor.csv'
+        test_data.to_csv(test_file, index=False)
+        
+        expected = preprocess_pipeline(test_file)
+        df = load_data(test_file)
+        result = Preprocessor().fit(df).transform(df)
+        
+        pd.testing.assert_frame_equal(result, expected)
+        
+        os.remove(test_file)
+    
+    def test_transform_uses_training_modes(self):
+        """Vérifie que les valeurs manquantes sont remplies avec les modes appris"""
+        preprocessor = Preprocessor().fit(make_students())
+        batch = make_students().iloc[[2]].copy()
+        
+        result = preprocessor.transform(batch)
+        
+        # Mode appris : Teacher_Quality = High (2), Distance_from_Home = Far (2)
+        assert result['Teacher_Quality'].tolist() == [2]
+        assert result['Distance_from_Home'].tolist() == [2]
+    
+    def test_transform_keeps_frozen_columns(self):
+        """Vérifie que le schéma de sortie ne dépend pas du lot transformé"""
+        preprocessor = Preprocessor().fit(make_students())
+        batch = make_students().iloc[[0]]
+        
+        result = preprocessor.transform(batch)
+        
+        assert list(result.columns) == preprocessor.columns_, \
+            "Les colonnes doivent suivre le schéma appris"
+        assert result['School_Type_Public'].tolist() == [True]
+        assert result['Peer_Influence_Neutral'].tolist() == [False]
+    
+    def test_transform_without_target(self):
+        """Vérifie qu'un lot sans Exam_Score peut être scoré"""
+        preprocessor = Preprocessor().fit(make_students())
+        batch = make_students().drop(columns='Exam_Score')
+        
+        result = preprocessor.transform(batch)
+        
+        assert list(result.columns) == preprocessor.feature_columns_
+    
+    def test_transform_one_matches_transform(self):
+        """Vérifie que transform_one encode comme transform"""
+        preprocessor = Preprocessor().fit(make_students())
+        df = make_students()
+        expected = preprocessor.transform(df)
+        
+        for i in range(len(df)):
+            record = df.iloc[i].to_dict()
+            result = preprocessor.transform_one(record)
+            assert result.iloc[0].tolist() == expected.iloc[i].tolist()
+    
+    def test_transform_before_fit_raises(self):
+        """Vérifie qu'un Preprocessor non entraîné refuse de transformer"""
+        with pytest.raises(ValueError):
+            Preprocessor().transform(make_students())
+    
+    def test_save_and_load(self):
+        """Vérifie que l'état appris survit à la sérialisation"""
+        preprocessor = Preprocessor().fit(make_students())
+        test_file = 'test_preprocessor.pkl'
+        preprocessor.save(test_file)
+        
+        loaded = Preprocessor.load(test_file)
+        
+        pd.testing.assert_frame_equal(
+            loaded.transform(make_students()),
+            preprocessor.transform(make_students())
+        )
+        
+        os.remove(test_file)
+
+    def test_feature_means_match_transform(self):
+        """Vérifie les moyennes de features stockées, après sérialisation"""
+        df = make_students()
+        preprocessor = Preprocessor().fit(df)
+        expected = preprocessor.transform(df).drop(columns='Exam_Score').astype(float).mean()
+
+        loaded = Preprocessor.from_dict(preprocessor.to_dict())
+
+        means = pd.Series(loaded.feature_means_)
+        pd.testing.assert_series_equal(means, expected, check_names=False)
+
+
+class TestPreprocessChunks:
+    """Tests pour le preprocessing en streaming par blocs"""
+    
+    def test_chunks_match_pipeline(self):
+        """Vérifie que la concaténation des blocs égale preprocess_pipeline"""
+        test_data = pd.concat([make_students()] * 3, ignore_index=True)
+        test_file = 'test_chunks.csv'
+        test_data.to_csv(test_file, index=False)
+        
+        expected = preprocess_pipeline(test_file)
+        chunks = list(preprocess_chunks(test_file, chunksize=5))
+        
+        assert len(chunks) == 3, "Le fichier doit être lu en 3 blocs"
+        pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+        
+        os.remove(test_file)
+    
+    def test_streaming_fit_matches_in_memory_fit(self):
+        """Vérifie que l'apprentissage par blocs donne le même état"""
+        test_data = make_students()
+        test_file = 'test_chunks.csv'
+        test_data.to_csv(test_file, index=False)
+        
+        streamed = fit_preprocessor(test_file, chunksize=1)
+        in_memory = Preprocessor().fit(load_data(test_file))
+        
+        assert streamed.modes_ == in_memory.modes_
+        assert streamed.columns_ == in_memory.columns_
+        
+        os.remove(test_file)
+    
+    def test_chunks_with_fitted_preprocessor(self):
+        """Vérifie qu'un état déjà appris est réutilisé sans première passe"""
+        preprocessor = Preprocessor().fit(make_students())
+        test_data = make_students().drop(columns='Exam_Score')
+        test_file = 'test_chunks.csv'
+        test_data.to_csv(test_file, index=False)
+        
+        chunks = list(preprocess_chunks(test_file, chunksize=2, preprocessor=preprocessor))
+        
+        pd.testing.assert_frame_equal(pd.concat(chunks), preprocessor.transform(test_data))
+        
+        os.remove(test_file)
+
+
+class TestTypedLoading:
+    """Tests pour le chargement typé selon le schéma déclaré"""
+    
+    def test_typed_load_uses_compact_dtypes(self):
+        """Vérifie les types category et entiers compacts"""
+        test_data = make_students()
+        test_file = 'test_typed.csv'
+        test_data.to_csv(test_file, index=False)
+        
+        result = load_data(test_file, typed=True)
+        
+        assert isinstance(result['Gender'].dtype, pd.CategoricalDtype)
+        assert result['Sleep_Hours'].dtype == np.int8
+        assert result['Attendance'].dtype == np.int8
+        
+        os.remove(test_file)
+    
+    def test_typed_pipeline_matches_default(self):
+        """Vérifie que l'encodage sur codes donne les mêmes valeurs"""
+        test_data = make_students()
+        test_file = 'test_typed.csv'
+        test_data.to_csv(test_file, index=False)
+        
+        expected = preprocess_pipeline(test_file)
+        result = preprocess_pipeline(test_file, typed=True)
+        
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+        assert result['Teacher_Quality'].dtype == np.int8
+        
+        os.remove(test_file)
+    
+    def test_typed_load_rejects_overflow(self):
+        """Vérifie qu'une valeur hors de la plage du type compact est refusée"""
+        test_data = make_students()
+        test_data.loc[0, 'Attendance'] = 300
+        test_file = 'test_typed.csv'
+        test_data.to_csv(test_file, index=False)
+        
+        with pytest.raises(ValueError):
+            load_data(test_file, typed=True)
+        
+        os.remove(test_file)
+
+    def test_typed_load_rejects_fractional_values(self):
+        """Vérifie qu'une valeur non entière n'est pas tronquée en silence"""
+        test_data = make_students().astype({'Sleep_Hours': float})
+        test_data.loc[0, 'Sleep_Hours'] = 7.5
+        test_file = 'test_typed.csv'
+        test_data.to_csv(test_file, index=False)
+        
+        with pytest.raises(ValueError, match='Sleep_Hours'):
+            load_data(test_file, typed=True)
+        
+        os.remove(test_file)
+
 # Point d'entrée pour exécuter les tests
 if __name__ == "__main__":
     
@@ -0,0 +1,157 @@
+"""
+Tests Unitaires du classement des etudiants a risque
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import joblib
+import shutil
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ranking import TopKAtRisk, LinearExplainer, OVERALL, PREDICTION_COLUMN
+from score import main
+from test_preprocessing import make_students
+from test_score import fit_model
+
+RANKING_DIR = 'test_ranking_dir'
+
+
+def split(df, size):
+    """Découpe un DataFrame en blocs en gardant l'index global"""
+    return [df.iloc[start:start + size] for start in range(0, len(df), size)]
+
+
+class TestTopKAtRisk:
+    """Tests pour le tas borné des k prédictions les plus basses"""
+
+    def setup_method(self):
+        rng = np.random.default_rng(0)
+        self.n = 1000
+        self.df = pd.DataFrame({
+            'School_Type': rng.choice(['Public', 'Private'], self.n),
+            'School_Id': rng.integers(0, 20, self.n)
+        })
+        self.predictions = rng.normal(67, 4, self.n)
+
+    def rank(self, k, group_by=None, size=97):
+        ranking = TopKAtRisk(k, group_by)
+        for chunk in split(self.df, size):
+            ranking.update(chunk, self.predictions[chunk.index])
+        return ranking.to_frame()
+
+    def test_overall_matches_full_sort(self):
+        """Vérifie que le classement global égale un tri complet"""
+        result = self.rank(10)
+
+        expected = np.argsort(self.predictions)[:10]
+        assert result['group'].eq(OVERALL).all()
+        assert result['row'].tolist() == expected.tolist()
+        assert result['rank'].tolist() == list(range(1, 11))
+        np.testing.assert_allclose(result[PREDICTION_COLUMN], self.predictions[expected])
+
+    def test_groups_match_groupby_sort(self):
+        """Vérifie le classement par groupe contre un tri pandas par groupe"""
+        result = self.rank(5, group_by='School_Id')
+
+        frame = self.df.assign(pred=self.predictions)
+        for school, rows in frame.groupby('School_Id'):
+            expected = rows.nsmallest(5, 'pred').index.tolist()
+            assert result.loc[result['group'] == school, 'row'].tolist() == expected
+        assert (result['group'] == OVERALL).sum() == 5
+
+    def test_memory_is_bounded(self):
+        """Vérifie qu'au plus k entrées sont gardées par groupe"""
+        ranking = TopKAtRisk(3, 'School_Type')
+        for chunk in split(self.df, 50):
+            ranking.update(chunk, self.predictions[chunk.index])
+
+        assert set(ranking._heaps) == {OVERALL, 'Public', 'Private'}
+        assert all(len(heap) == 3 for heap in ranking._heaps.values())
+
+    def test_fewer_rows_than_k(self):
+        """Vérifie un classement plus court que k sans erreur"""
+        ranking = TopKAtRisk(10)
+        ranking.update(self.df.iloc[:4], self.predictions[:4])
+
+        assert ranking.to_frame()['row'].tolist() == np.argsort(self.predictions[:4]).tolist()
+
+    def test_empty(self):
+        """Vérifie le classement vide"""
+        result = TopKAtRisk(5).to_frame()
+
+        assert len(result) == 0
+        assert PREDICTION_COLUMN in result.columns
+
+
+class TestLinearExplainer:
+    """Tests pour les contributions des features d'un modèle linéaire"""
+
+    def setup_method(self):
+        self.students = pd.concat([make_students()] * 5, ignore_index=True)
+        self.model, self.preprocessor = fit_model(self.students)
+        self.explainer = LinearExplainer.from_model(self.model, self.preprocessor)
+
+    def test_reference_is_training_mean(self):
+        """Vérifie que la référence stockée égale la moyenne des features d'entraînement"""
+        encoded = self.preprocessor.transform(self.students.drop(columns='Exam_Score'))
+
+        np.testing.assert_allclose(self.explainer.reference, encoded.astype(float).mean())
+
+    def test_contributions_sum_to_prediction(self):
+        """Vérifie que moyenne + contributions redonne la prédiction"""
+        records = self.students.drop(columns='Exam_Score')
+        contributions = self.explainer.contributions(records)
+
+        X = self.preprocessor.transform(records)
+        baseline = self.explainer.reference @ self.explainer.coef + self.model.intercept_
+        np.testing.assert_allclose(baseline + contributions.sum(axis=1),
+                                   self.model.predict(X))
+
+    def test_drivers_are_negative_contributions(self):
+        """Vérifie que les drivers listent les contributions négatives"""
+        drivers = self.explainer.drivers(self.students.iloc[:4], n=2)
+
+        assert len(drivers) == 4
+        assert all(text.count(';') <= 1 for text in drivers)
+        assert all('(-' in text for text in drivers if text)
+
+    def test_non_linear_model(self):
+        """Vérifie qu'un modèle sans coefficients n'a pas d'explainer"""
+        assert LinearExplainer.from_model(object(), self.preprocessor) is None
+
+
+class TestScoreRanking:
+    """Tests pour l'option --top-k du scoring par lots"""
+
+    def setup_method(self):
+        os.makedirs(RANKING_DIR, exist_ok=True)
+        self.students = pd.concat([make_students()] * 5, ignore_index=True)
+        self.input_path = os.path.join(RANKING_DIR, 'input.csv')
+        self.output_path = os.path.join(RANKING_DIR, 'output.csv')
+        self.model_path = os.path.join(RANKING_DIR, 'model.pkl')
+        self.students.drop(columns='Exam_Score').to_csv(self.input_path, index=False)
+        self.preprocessor_path = os.path.join(RANKING_DIR, 'preprocessor.pkl')
+        model, preprocessor = fit_model(self.students)
+        joblib.dump(model, self.model_path)
+        preprocessor.save(self.preprocessor_path)
+
+    def teardown_method(self):
+        shutil.rmtree(RANKING_DIR, ignore_errors=True)
+
+    def test_cli_writes_ranking(self):
+        """Vérifie le classement écrit par la CLI, sans relire les données d'entraînement"""
+        main([self.input_path, self.output_path, '--model', self.model_path,
+              '--preprocessor', self.preprocessor_path, '--batch-size', '3',
+              '--top-k', '2', '--group-by', 'School_Type'])
+
+        predictions = pd.read_csv(self.output_path)
+        ranking = pd.read_csv(os.path.join(RANKING_DIR, 'output_ranking.csv'))
+        overall = ranking[ranking['group'] == OVERALL]
+        np.testing.assert_allclose(overall[PREDICTION_COLUMN],
+                                   np.sort(predictions[PREDICTION_COLUMN])[:2])
+        assert set(ranking['group']) == {OVERALL, 'Public', 'Private'}
+        assert {'drivers', 'Attendance', 'School_Type'} <= set(ranking.columns)
@@ -0,0 +1,127 @@
+"""
+Tests Unitaires du Ridge par statistiques suffisantes
+Les résultats sont comparés à sklearn.linear_model.Ridge et GridSearchCV.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import GridSearchCV
+
+from ridge import (RidgeStats, stats_from_chunks, contiguous_folds, fold_stats,
+                   cross_validate, grid_search)
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw',
+                         'StudentPerformanceFactors.csv')
+ALPHAS = [0.001, 0.01, 0.1, 1, 10, 100]
+
+
+def make_regression(n=500, p=6, seed=0):
+    """Jeu de régression synthétique"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, p)) * [1, 5, 10, 0.1, 2, 3] + 50
+    y = X @ rng.normal(size=p) + rng.normal(size=n)
+    return X, y
+
+
+class TestRidgeStats:
+    """Tests pour la classe RidgeStats"""
+    
+    @pytest.mark.parametrize('alpha', ALPHAS)
+    def test_coefficients_match_sklearn(self, alpha):
+        """Vérifie les coefficients et l'intercept contre sklearn"""
+        X, y = make_regression()
+        expected = Ridge(alpha=alpha).fit(X, y)
+        
+        coef, intercept = RidgeStats.from_data(X, y).solve(alpha)
+        
+        np.testing.assert_allclose(coef, expected.coef_, rtol=1e-8, atol=1e-10)
+        assert intercept == pytest.approx(expected.intercept_)
+    
+    def test_merged_blocks_equal_full_data(self):
+        """Vérifie que la fusion de blocs donne les statistiques globales"""
+        X, y = make_regression()
+        full = RidgeStats.from_data(X, y)
+        
+        merged = RidgeStats(X.shape[1])
+        for start in range(0, len(y), 70):
+            merged.update(X[start:start + 70], y[start:start + 70])
+        
+        assert merged.n == full.n
+        np.testing.assert_allclose(merged.xx, full.xx)
+        np.testing.assert_allclose(merged.xy, full.xy)
+        np.testing.assert_allclose(merged.solve(1.0)[0], full.solve(1.0)[0])
+    
+    def test_r2_matches_direct_computation(self):
+        """Vérifie le R² calculé à partir des statistiques"""
+        X, y = make_regression()
+        model = Ridge(alpha=1.0).fit(X[:400], y[:400])
+        
+        result = RidgeStats.from_data(X[400:], y[400:]).r2(model.coef_, model.intercept_)
+        
+        assert result == pytest.approx(model.score(X[400:], y[400:]))
+    
+    def test_stats_from_preprocessed_chunks(self):
+        """Vérifie l'accumulation sur des blocs préprocessés"""
+        chunk = pd.DataFrame({'a': [1.0, 2.0, 3.0, 4.0], 'Exam_Score': [2.0, 4.0, 6.1, 8.0]})
+        
+        stats = stats_from_chunks([chunk.iloc[:2], chunk.iloc[2:]])
+        
+        assert stats.columns == ['a']
+        np.testing.assert_allclose(stats.solve(0.5)[0], Ridge(alpha=0.5).fit(chunk[['a']], chunk['Exam_Score']).coef_)
+
+
+class TestCrossValidation:
+    """Tests de la validation croisée sur la grille d'alpha"""
+    
+    def test_grid_search_matches_sklearn(self):
+        """Vérifie les scores CV contre GridSearchCV(cv=5) sur les vraies données"""
+        from preprocessing import preprocess_pipeline
+        df = preprocess_pipeline(DATA_PATH)
+        X = df.drop(columns='Exam_Score').to_numpy(dtype=np.float64)
+        y = df['Exam_Score'].to_numpy(dtype=np.float64)
+        search = GridSearchCV(Ridge(), {'alpha': ALPHAS}, cv=5, scoring='r2').fit(X, y)
+        
+        best_alpha, mean_scores = grid_search(fold_stats(X, y, 5), ALPHAS)
+        
+        np.testing.assert_allclose(mean_scores, search.cv_results_['mean_test_score'], rtol=1e-9)
+        assert best_alpha == search.best_params_['alpha']
+    
+    def test_fold_sizes_like_kfold(self):
+        """Vérifie le découpage contigu des folds"""
+        X, y = make_regression(n=23)
+        
+        folds = fold_stats(X, y, 5)
+        
+        assert [fold.n for fold in folds] == [5, 5, 5, 4, 4]
+        assert cross_validate(folds, ALPHAS).shape == (len(ALPHAS), 5)
+    
+    def test_streamed_folds_match_fold_stats(self):
+        """Vérifie les folds accumulés en streaming contre fold_stats"""
+        X, y = make_regression(n=23)
+        df = pd.DataFrame(X, columns=[f'x{i}' for i in range(X.shape[1])])
+        df['Exam_Score'] = y
+        chunks = [df.iloc[i:i + 4] for i in range(0, len(df), 4)]
+        
+        streamed = stats_from_chunks(chunks, n_folds=5, fold_of=contiguous_folds(len(df)))
+        
+        expected = fold_stats(X, y, 5)
+        assert [fold.n for fold in streamed] == [fold.n for fold in expected]
+        np.testing.assert_allclose(cross_validate(streamed, ALPHAS), cross_validate(expected, ALPHAS))
+    
+    def test_streamed_folds_default_assignment(self):
+        """Vérifie l'affectation par défaut (numéro de ligne modulo n_folds)"""
+        X, y = make_regression(n=23)
+        df = pd.DataFrame(X, columns=[f'x{i}' for i in range(X.shape[1])])
+        df['Exam_Score'] = y
+        
+        folds = stats_from_chunks([df.iloc[:10], df.iloc[10:]], n_folds=5)
+        
+        assert [fold.n for fold in folds] == [5, 5, 5, 4, 4]
+        np.testing.assert_allclose(folds[1].mean_y, y[1::5].mean())
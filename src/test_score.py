@@ -0,0 +1,122 @@
+"""
+Tests Unitaires du scoring par lots
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import joblib
+import shutil
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.linear_model import Ridge
+
+from preprocessing import Preprocessor
+from score import score_file, load_preprocessor, main, DEFAULT_PREPROCESSOR, PREDICTION_COLUMN
+from test_preprocessing import make_students
+
+SCORE_DIR = 'test_score_dir'
+
+
+def fit_model(df):
+    """Entraîne un petit Ridge sur les données preprocessées"""
+    preprocessor = Preprocessor().fit(df)
+    encoded = preprocessor.transform(df)
+    model = Ridge().fit(encoded.drop(columns='Exam_Score'), encoded['Exam_Score'])
+    return model, preprocessor
+
+
+class TestScoreFile:
+    """Tests pour le scoring par lots"""
+    
+    def setup_method(self):
+        os.makedirs(SCORE_DIR, exist_ok=True)
+        self.students = pd.concat([make_students()] * 5, ignore_index=True)
+        self.input_path = os.path.join(SCORE_DIR, 'input.csv')
+        self.output_path = os.path.join(SCORE_DIR, 'output.csv')
+        self.students.drop(columns='Exam_Score').to_csv(self.input_path, index=False)
+        self.model, self.preprocessor = fit_model(self.students)
+    
+    def teardown_method(self):
+        shutil.rmtree(SCORE_DIR, ignore_errors=True)
+    
+    def expected_predictions(self):
+        X = self.preprocessor.transform(self.students.drop(columns='Exam_Score'))
+        return self.model.predict(X)
+    
+    def test_batches_match_full_predict(self):
+        """Vérifie que le scoring par blocs égale une prédiction globale"""
+        stats = score_file(self.input_path, self.output_path, self.model,
+                           self.preprocessor, batch_size=3)
+        
+        result = pd.read_csv(self.output_path)
+        assert stats['rows'] == len(self.students)
+        assert result['row'].tolist() == list(range(len(self.students)))
+        np.testing.assert_allclose(result[PREDICTION_COLUMN], self.expected_predictions())
+    
+    def test_workers_preserve_order(self):
+        """Vérifie que le pool de workers garde l'ordre des lignes"""
+        score_file(self.input_path, self.output_path, self.model,
+                   self.preprocessor, batch_size=3, workers=2)
+        
+        result = pd.read_csv(self.output_path)
+        np.testing.assert_allclose(result[PREDICTION_COLUMN], self.expected_predictions())
+    
+    def test_invalid_rows_are_quarantined(self):
+        """Vérifie que les lignes invalides sont écartées du scoring"""
+        students = self.students.drop(columns='Exam_Score')
+        students.loc[3, 'Gender'] = 'Autre'
+        students.to_csv(self.input_path, index=False)
+        quarantine_path = os.path.join(SCORE_DIR, 'quarantine.csv')
+        
+        stats = score_file(self.input_path, self.output_path, self.model,
+                           self.preprocessor, batch_size=3, quarantine=quarantine_path)
+        
+        result = pd.read_csv(self.output_path)
+        assert stats['quarantined'] == 1
+        assert 3 not in result['row'].tolist()
+        assert pd.read_csv(quarantine_path)['row'].tolist() == [3]
+
+    def test_fully_quarantined_first_batch(self):
+        """Vérifie qu'un premier bloc entièrement rejeté ne casse pas le scoring"""
+        students = self.students.drop(columns='Exam_Score')
+        students.loc[:2, 'Gender'] = 'Autre'
+        students.to_csv(self.input_path, index=False)
+        quarantine_path = os.path.join(SCORE_DIR, 'quarantine.csv')
+
+        stats = score_file(self.input_path, self.output_path, self.model,
+                           self.preprocessor, batch_size=3, quarantine=quarantine_path)
+
+        result = pd.read_csv(self.output_path)
+        assert stats['quarantined'] == 3
+        assert stats['rows'] == len(students) - 3
+        assert result['row'].tolist() == list(range(3, len(students)))
+        np.testing.assert_allclose(result[PREDICTION_COLUMN], self.expected_predictions()[3:])
+
+    def test_command_line(self):
+        """Vérifie le point d'entrée en ligne de commande"""
+        model_path = os.path.join(SCORE_DIR, 'model.pkl')
+        preprocessor_path = os.path.join(SCORE_DIR, 'preprocessor.pkl')
+        joblib.dump(self.model, model_path)
+        self.preprocessor.save(preprocessor_path)
+        
+        stats = main([self.input_path, self.output_path, '--model', model_path,
+                      '--preprocessor', preprocessor_path, '--batch-size', '7'])
+        
+        assert stats['rows'] == len(self.students)
+        assert stats['rows_per_second'] > 0
+        assert len(pd.read_csv(self.output_path)) == len(self.students)
+
+    def test_default_preprocessor_is_not_refit(self, monkeypatch):
+        """Vérifie que le preprocessing par défaut est rechargé, jamais réappris"""
+        def refit(*args, **kwargs):
+            raise AssertionError("preprocessing reappris")
+        monkeypatch.setattr('score.fit_preprocessor', refit)
+
+        preprocessor = load_preprocessor(self.model)
+
+        expected = Preprocessor.load(DEFAULT_PREPROCESSOR).to_dict()
+        assert preprocessor.to_dict() == expected
@@ -0,0 +1,184 @@
+"""
+Tests Unitaires du service de prediction avec micro-lots
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import json
+import threading
+import urllib.request
+import urllib.error
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server import MicroBatcher, make_server, model_predict_fn
+from test_preprocessing import make_students
+from test_score import fit_model
+
+
+class TestMicroBatcher:
+    """Tests pour le regroupement des requêtes en micro-lots"""
+    
+    def test_concurrent_requests_are_batched(self):
+        """Vérifie que des requêtes simultanées partagent un lot"""
+        batch_sizes = []
+        
+        def predict_fn(records):
+            batch_sizes.append(len(records))
+            return [record['x'] * 2 for record in records]
+        
+        batcher = MicroBatcher(predict_fn, max_batch_size=8, max_wait_ms=200)
+        futures = [batcher.submit({'x': i}) for i in range(8)]
+        results = [future.result(timeout=5) for future in futures]
+        batcher.close()
+        
+        assert results == [i * 2 for i in range(8)]
+        assert batch_sizes == [8]
+        assert batcher.metrics.snapshot()['mean_batch_size'] == 8
+    
+    def test_max_batch_size_is_respected(self):
+        """Vérifie qu'un lot ne dépasse pas max_batch_size"""
+        batch_sizes = []
+        
+        def predict_fn(records):
+            batch_sizes.append(len(records))
+            return [0] * len(records)
+        
+        batcher = MicroBatcher(predict_fn, max_batch_size=3, max_wait_ms=50)
+        futures = [batcher.submit({}) for _ in range(7)]
+        for future in futures:
+            future.result(timeout=5)
+        batcher.close()
+        
+        assert max(batch_sizes) <= 3
+        assert sum(batch_sizes) == 7
+    
+    def test_errors_are_propagated(self):
+        """Vérifie qu'une erreur de prédiction est renvoyée à la requête fautive"""
+        def predict_fn(records):
+            raise ValueError("enregistrement invalide")
+        
+        batcher = MicroBatcher(predict_fn, max_wait_ms=1)
+        with pytest.raises(ValueError):
+            batcher.predict({}, timeout=5)
+        batcher.close()
+        
+        assert batcher.metrics.snapshot()['errors'] == 1
+    
+    def test_bad_record_does_not_fail_batch(self):
+        """Vérifie que les requêtes saines d'un lot aboutissent malgré une requête fautive"""
+        def predict_fn(records):
+            return [float(record['x']) * 2 for record in records]
+        
+        batcher = MicroBatcher(predict_fn, max_batch_size=3, max_wait_ms=200)
+        futures = [batcher.submit({'x': 1}), batcher.submit({'x': 'abc'}),
+                   batcher.submit({'x': 3})]
+        
+        assert futures[0].result(timeout=5) == 2
+        assert futures[2].result(timeout=5) == 6
+        with pytest.raises(ValueError):
+            futures[1].result(timeout=5)
+        batcher.close()
+        
+        snapshot = batcher.metrics.snapshot()
+        assert (snapshot['requests'], snapshot['errors']) == (3, 1)
+
+
+class TestPredictionServer:
+    """Tests de bout en bout du serveur HTTP"""
+    
+    def setup_method(self):
+        self.students = make_students()
+        self.model, self.preprocessor = fit_model(self.students)
+        self.server = make_server(self.model, self.preprocessor, port=0, max_wait_ms=1)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+    
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server.batcher.close()
+    
+    def post(self, payload):
+        request = urllib.request.Request(self.url + '/predict', data=json.dumps(payload).encode())
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+    
+    def test_predict_matches_model(self):
+        """Vérifie que la prédiction du service égale celle du modèle"""
+        students = self.students.drop(columns='Exam_Score')
+        record = students.astype(object).where(students.notna(), None).iloc[0].to_dict()
+        expected = self.model.predict(self.preprocessor.transform(students.iloc[[0]]))[0]
+        
+        result = self.post(record)
+        
+        assert result['prediction'] == pytest.approx(expected)
+    
+    def test_invalid_record_returns_400(self):
+        """Vérifie qu'un enregistrement incomplet est refusé"""
+        with pytest.raises(urllib.error.HTTPError) as error:
+            self.post({'Hours_Studied': 10})
+        
+        assert error.value.code == 400
+    
+    def test_missing_field_returns_400(self):
+        """Vérifie qu'un champ manquant est refusé même au sein d'un lot"""
+        students = self.students.drop(columns='Exam_Score')
+        record = students.astype(object).where(students.notna(), None).iloc[0].to_dict()
+        del record['Gender']
+        
+        with pytest.raises(urllib.error.HTTPError) as error:
+            self.post(record)
+        
+        assert error.value.code == 400
+        assert 'Gender' in json.loads(error.value.read())['error']
+    
+    @pytest.mark.parametrize('field, value, reason', [
+        ('Motivation_Level', 'Very High', 'Motivation_Level:modalite'),
+        ('Hours_Studied', 500, 'Hours_Studied:max')
+    ])
+    def test_invalid_values_return_400(self, field, value, reason):
+        """Vérifie que les règles de validation s'appliquent aux requêtes"""
+        students = self.students.drop(columns='Exam_Score')
+        record = students.astype(object).where(students.notna(), None).iloc[0].to_dict()
+        record[field] = value
+        
+        with pytest.raises(urllib.error.HTTPError) as error:
+            self.post(record)
+        
+        assert error.value.code == 400
+        assert reason in json.loads(error.value.read())['error']
+    
+    def test_metrics_endpoint(self):
+        """Vérifie l'exposition des compteurs et latences"""
+        record = self.students.drop(columns='Exam_Score').iloc[0].to_dict()
+        record = {key: (None if value != value else value) for key, value in record.items()}
+        self.post(record)
+        
+        with urllib.request.urlopen(self.url + '/metrics') as response:
+            metrics = json.loads(response.read())
+        
+        assert metrics['requests'] == 1
+        assert metrics['latency_p99_ms'] >= metrics['latency_p50_ms'] >= 0
+    
+    def test_non_finite_prediction_returns_500(self):
+        """Vérifie qu'une prédiction NaN n'est pas renvoyée comme JSON invalide"""
+        class NanModel:
+            def predict(self, X):
+                return np.full(len(X), np.nan)
+        
+        self.server.batcher.close()
+        self.server.batcher = MicroBatcher(model_predict_fn(NanModel(), self.preprocessor),
+                                           max_wait_ms=1)
+        students = self.students.drop(columns='Exam_Score')
+        record = students.astype(object).where(students.notna(), None).iloc[0].to_dict()
+        
+        with pytest.raises(urllib.error.HTTPError) as error:
+            self.post(record)
+        
+        assert error.value.code == 500
+        assert 'error' in json.loads(error.value.read())
@@ -0,0 +1,76 @@
+"""
+Tests Unitaires du preprocessing parallele multi-fichiers
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import json
+import shutil
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sharding import preprocess_shards, resolve_paths
+from preprocessing import preprocess_pipeline
+from test_preprocessing import make_students
+
+SHARD_DIR = 'test_shards'
+
+
+class TestPreprocessShards:
+    """Tests pour la fonction preprocess_shards"""
+    
+    def setup_method(self):
+        os.makedirs(SHARD_DIR, exist_ok=True)
+        students = make_students()
+        # Deux écoles aux distributions différentes : les modes par fichier diffèrent
+        students.iloc[:2].to_csv(os.path.join(SHARD_DIR, 'ecole_a.csv'), index=False)
+        students.iloc[2:].to_csv(os.path.join(SHARD_DIR, 'ecole_b.csv'), index=False)
+        students.to_csv(os.path.join(SHARD_DIR, 'all.csv.full'), index=False)
+    
+    def teardown_method(self):
+        shutil.rmtree(SHARD_DIR, ignore_errors=True)
+    
+    def test_shards_match_concatenated_file(self):
+        """Vérifie que les statistiques globales donnent le même résultat"""
+        expected = preprocess_pipeline(os.path.join(SHARD_DIR, 'all.csv.full'))
+        
+        result, timings = preprocess_shards(os.path.join(SHARD_DIR, '*.csv'), n_jobs=2)
+        
+        pd.testing.assert_frame_equal(result, expected)
+        assert timings['rows'].tolist() == [2, 2]
+        assert (timings['transform_seconds'] >= 0).all()
+    
+    def test_shards_written_to_output_dir(self):
+        """Vérifie l'écriture d'une matrice .npy par fichier"""
+        output_dir = os.path.join(SHARD_DIR, 'out')
+        expected = preprocess_pipeline(os.path.join(SHARD_DIR, 'all.csv.full'))
+        
+        paths, _ = preprocess_shards(os.path.join(SHARD_DIR, '*.csv'), n_jobs=1,
+                                     output_dir=output_dir)
+        
+        matrix = np.concatenate([np.load(path) for path in paths])
+        with open(os.path.join(output_dir, 'columns.json')) as f:
+            assert json.load(f) == list(expected.columns)
+        np.testing.assert_array_equal(matrix, expected.to_numpy(dtype=np.float64))
+    
+    def test_same_file_names_in_different_directories(self):
+        """Vérifie que deux fichiers de même nom ne s'écrasent pas"""
+        students = make_students()
+        paths = []
+        for school, rows in (('a', slice(0, 2)), ('b', slice(2, 4))):
+            os.makedirs(os.path.join(SHARD_DIR, school), exist_ok=True)
+            paths.append(os.path.join(SHARD_DIR, school, 'eleves.csv'))
+            students.iloc[rows].to_csv(paths[-1], index=False)
+        
+        outputs, _ = preprocess_shards(paths, n_jobs=1, output_dir=os.path.join(SHARD_DIR, 'out'))
+        
+        assert len(set(outputs)) == 2
+        assert [len(np.load(path)) for path in outputs] == [2, 2]
+    
+    def test_resolve_paths_without_match(self):
+        """Vérifie qu'un motif sans fichier lève une erreur explicite"""
+        with pytest.raises(ValueError):
+            resolve_paths(os.path.join(SHARD_DIR, '*.parquet'))
@@ -0,0 +1,200 @@
+"""
+Tests Unitaires de la validation vectorisée et de la quarantaine
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from validation import validate, ValidationRules, REASON_COLUMN
+from preprocessing import preprocess_chunks, preprocess_pipeline, load_data
+from test_preprocessing import make_students
+
+
+def make_invalid_students():
+    """Jeu de données avec une ligne invalide par type d'erreur"""
+    df = make_students().astype({'Attendance': object})
+    df.loc[0, 'Motivation_Level'] = 'Very High'
+    df.loc[1, 'Attendance'] = 140
+    df.loc[2, 'Gender'] = None
+    df.loc[3, 'Hours_Studied'] = -1
+    df = pd.concat([df, make_students()], ignore_index=True)
+    df.loc[4, 'Attendance'] = 'quatre-vingt'
+    return df
+
+
+class TestValidate:
+    """Tests pour la fonction validate"""
+    
+    def test_valid_rows_pass_through(self):
+        """Vérifie qu'un jeu valide n'est pas modifié"""
+        df = make_students()
+        
+        valid, rejected = validate(df)
+        
+        pd.testing.assert_frame_equal(valid, df)
+        assert len(rejected) == 0
+    
+    def test_each_rule_is_detected(self):
+        """Vérifie la détection et le motif de chaque type d'erreur"""
+        valid, rejected = validate(make_invalid_students())
+        
+        reasons = rejected[REASON_COLUMN].to_dict()
+        assert reasons == {
+            0: 'Motivation_Level:modalite',
+            1: 'Attendance:max',
+            2: 'Gender:vide',
+            3: 'Hours_Studied:min',
+            4: 'Attendance:type'
+        }
+        assert list(valid.index) == [5, 6, 7]
+    
+    def test_fractional_values_are_rejected(self):
+        """Vérifie qu'une valeur non entière d'une colonne entière est rejetée"""
+        df = make_students().astype({'Sleep_Hours': float})
+        df.loc[1, 'Sleep_Hours'] = 7.5
+        
+        valid, rejected = validate(df)
+        
+        assert rejected[REASON_COLUMN].to_dict() == {1: 'Sleep_Hours:type'}
+        assert valid['Sleep_Hours'].tolist() == [7, 6, 7]
+    
+    def test_imputed_columns_may_be_empty(self):
+        """Vérifie que les valeurs manquantes imputées restent acceptées"""
+        df = make_students()
+        
+        valid, _ = validate(df)
+        
+        assert valid['Teacher_Quality'].isna().sum() == 1
+    
+    def test_scores_above_100_are_accepted(self):
+        """Vérifie que les scores > 100 restent corrigés par handle_outliers"""
+        valid, rejected = validate(make_students())
+        
+        assert 101 in valid['Exam_Score'].tolist()
+    
+    def test_missing_column_raises(self):
+        """Vérifie qu'une colonne obligatoire absente lève une erreur"""
+        with pytest.raises(ValueError):
+            validate(make_students().drop(columns='Gender'))
+    
+    def test_target_is_optional(self):
+        """Vérifie qu'un lot à scorer sans Exam_Score est valide"""
+        valid, rejected = validate(make_students().drop(columns='Exam_Score'))
+        
+        assert len(valid) == 4 and len(rejected) == 0
+    
+    def test_category_columns(self):
+        """Vérifie la validation sur colonnes category (chargement typé)"""
+        df = make_students()
+        df.loc[0, 'Motivation_Level'] = 'Very High'
+        df.loc[2, 'Gender'] = None
+        df.to_csv('test_validation.csv', index=False)
+        
+        valid, rejected = validate(load_data('test_validation.csv', typed=True))
+        
+        assert rejected[REASON_COLUMN].to_dict() == {
+            0: 'Motivation_Level:modalite',
+            2: 'Gender:vide'
+        }
+        assert list(valid.index) == [1, 3]
+        
+        os.remove('test_validation.csv')
+    
+    def test_custom_rules(self):
+        """Vérifie des règles déclarées sur mesure"""
+        rules = ValidationRules(ranges={'Hours_Studied': (12, None)}, allowed={})
+        
+        valid, rejected = validate(make_students(), rules)
+        
+        assert rejected.index.tolist() == [0]
+
+
+class TestQuarantine:
+    """Tests de la quarantaine dans le preprocessing en streaming"""
+    
+    def test_bad_rows_go_to_quarantine(self):
+        """Vérifie que seules les lignes valides sont apprises et encodées"""
+        make_invalid_students().to_csv('test_validation.csv', index=False)
+        make_students().to_csv('test_validation_ok.csv', index=False)
+        
+        chunks = list(preprocess_chunks('test_validation.csv', chunksize=3,
+                                        quarantine='test_quarantine.csv'))
+        quarantine = pd.read_csv('test_quarantine.csv')
+        
+        result = pd.concat(chunks)
+        expected = preprocess_pipeline('test_validation_ok.csv')
+        assert quarantine['row'].tolist() == [0, 1, 2, 3, 4]
+        assert 'Motivation_Level:modalite' in quarantine[REASON_COLUMN].tolist()
+        assert list(result.index) == [5, 6, 7]
+        assert list(result.columns) == list(expected.columns)
+        
+        for path in ['test_validation.csv', 'test_validation_ok.csv', 'test_quarantine.csv']:
+            os.remove(path)
+
+    def test_typed_chunks_quarantine_before_downcast(self):
+        """Vérifie qu'en mode typé une valeur illisible ou hors plage va en quarantaine"""
+        df = make_invalid_students()
+        df.loc[1, 'Attendance'] = 300
+        df.to_csv('test_validation.csv', index=False)
+        make_students().to_csv('test_validation_ok.csv', index=False)
+
+        try:
+            chunks = list(preprocess_chunks('test_validation.csv', chunksize=3, typed=True,
+                                            quarantine='test_quarantine.csv'))
+            quarantine = pd.read_csv('test_quarantine.csv')
+            expected = preprocess_pipeline('test_validation_ok.csv')
+        finally:
+            for path in ['test_validation.csv', 'test_validation_ok.csv', 'test_quarantine.csv']:
+                os.remove(path)
+
+        result = pd.concat(chunks)
+        reasons = dict(zip(quarantine['row'], quarantine[REASON_COLUMN]))
+        assert reasons[1] == 'Attendance:max'
+        assert reasons[4] == 'Attendance:type'
+        assert list(result.index) == [5, 6, 7]
+        assert list(result.columns) == list(expected.columns)
+
+    @pytest.mark.parametrize('col', ['Hours_Studied', 'Exam_Score'])
+    def test_valid_rows_converted_after_unreadable_cell(self, col):
+        """Vérifie qu'une cellule illisible ne laisse pas de texte dans les lignes valides"""
+        df = pd.concat([make_students()] * 2, ignore_index=True).astype({col: object})
+        df.loc[0, col] = 'abc'
+        df.to_csv('test_validation.csv', index=False)
+        df.iloc[1:].to_csv('test_validation_ok.csv', index=False)
+
+        try:
+            result = pd.concat(preprocess_chunks('test_validation.csv', chunksize=3,
+                                                 quarantine='test_quarantine.csv'))
+            quarantine = pd.read_csv('test_quarantine.csv')
+            expected = preprocess_pipeline('test_validation_ok.csv')
+        finally:
+            for path in ['test_validation.csv', 'test_validation_ok.csv', 'test_quarantine.csv']:
+                os.remove(path)
+
+        assert quarantine[REASON_COLUMN].tolist() == [f'{col}:type']
+        assert pd.api.types.is_numeric_dtype(result[col])
+        pd.testing.assert_frame_equal(result.reset_index(drop=True), expected, check_dtype=False)
+
+    def test_typed_chunks_accept_scores_above_int8(self):
+        """Vérifie qu'un score > 127 est plafonné à 100 en mode typé, comme sans typage"""
+        df = make_students()
+        df.loc[0, 'Exam_Score'] = 150
+        df.to_csv('test_validation.csv', index=False)
+
+        try:
+            typed = pd.concat(preprocess_chunks('test_validation.csv', chunksize=3, typed=True,
+                                                quarantine='test_quarantine.csv'))
+            quarantined = os.path.getsize('test_quarantine.csv')
+            expected = preprocess_pipeline('test_validation.csv')
+        finally:
+            for path in ['test_validation.csv', 'test_quarantine.csv']:
+                os.remove(path)
+
+        assert quarantined == 0
+        assert typed.loc[0, 'Exam_Score'] == 100
+        pd.testing.assert_frame_equal(typed, expected, check_dtype=False)
@@ -0,0 +1,189 @@
+"""
+Validation vectorisee des donnees brutes avec mise en quarantaine
+
+Les regles sont declarees dans schema.py (types, plages, modalites
+autorisees, colonnes pouvant etre vides). Chaque regle produit un masque
+booleen calcule sur toute la colonne ; les lignes invalides sont
+separees avec la liste de leurs motifs, les lignes valides continuent
+dans le pipeline.
+
+Sur des colonnes category (load_data / iter_chunks avec typed=True), le
+test des modalites porte sur les quelques categories puis sur les codes
+entiers, sans comparer de chaines ligne par ligne.
+"""
+
+import numpy as np
+import pandas as pd
+
+from schema import TARGET, NUMERIC_DTYPES, NUMERIC_RANGES, CATEGORY_LEVELS, IMPUTE_COLUMNS
+from instrumentation import stage
+
+REASON_COLUMN = '_reasons'
+ROW_COLUMN = 'row'
+
+
+class ValidationRules:
+    """Regles de validation ; par defaut celles du schema declare"""
+
+    def __init__(self, ranges=None, allowed=None, nullable=None, optional=None,
+                 integers=None):
+        self.ranges = NUMERIC_RANGES if ranges is None else ranges
+        # Colonnes a valeurs entieres (type compact entier au chargement type)
+        self.integers = set(col for col, dtype in NUMERIC_DTYPES.items()
+                            if dtype.startswith('int')) if integers is None else set(integers)
+        self.allowed = CATEGORY_LEVELS if allowed is None else allowed
+        self.nullable = set(IMPUTE_COLUMNS if nullable is None else nullable)
+        # Colonnes qui peuvent manquer du fichier (la cible lors du scoring)
+        self.optional = {TARGET} if optional is None else set(optional)
+
+    def required_columns(self):
+        """Colonnes que chaque ligne doit contenir"""
+        return (set(self.ranges) | set(self.allowed)) - self.optional
+
+    def check_columns(self, df):
+        """Leve ValueError si une colonne obligatoire manque (df ou dict)"""
+        missing = sorted(self.required_columns() - set(df.keys()))
+        if missing:
+            raise ValueError(f"Colonnes manquantes : {missing}")
+
+    def masks(self, df):
+        """Liste de (motif, masque des lignes en erreur)"""
+        masks = []
+        for col, (low, high) in self.ranges.items():
+            if col not in df.columns:
+                continue
+            raw = df[col]
+            if pd.api.types.is_integer_dtype(raw.dtype):
+                # Entiers : ni valeur vide ni valeur illisible possible
+                array = raw.to_numpy()
+                if low is not None:
+                    masks.append((f'{col}:min', array < low))
+                if high is not None:
+                    masks.append((f'{col}:max', array > high))
+                continue
+            if pd.api.types.is_numeric_dtype(raw.dtype):
+                values = raw
+            else:
+                values = pd.to_numeric(raw, errors='coerce')
+            missing = values.isna().to_numpy()
+            if missing.any():
+                # Valeur non numerique : presente dans le CSV mais illisible
+                masks.append((f'{col}:type', missing & raw.notna().to_numpy()))
+                if col not in self.nullable:
+                    masks.append((f'{col}:vide', raw.isna().to_numpy()))
+            array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            if col in self.integers:
+                # 7.5 serait tronque en 7 par la conversion en entier compact
+                masks.append((f'{col}:type', ~np.isnan(array) & (array != np.floor(array))))
+            with np.errstate(invalid='ignore'):
+                if low is not None:
+                    masks.append((f'{col}:min', array < low))
+                if high is not None:
+                    masks.append((f'{col}:max', array > high))
+        for col, levels in self.allowed.items():
+            if col not in df.columns:
+                continue
+            masks += self._category_masks(col, df[col], levels)
+        return masks
+
+
+    def _category_masks(self, col, values, levels):
+        allowed = list(levels) + ([np.nan] if col in self.nullable else [])
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Test sur les quelques categories puis sur les codes entiers
+            # (table indexee par code ; le code -1 pointe sur la derniere case)
+            categories = values.cat.categories
+            accepted = np.array([cat in levels for cat in categories] + [col in self.nullable])
+            if accepted.all():
+                return []
+            codes = values.cat.codes.to_numpy()
+            if accepted[:-1].all():
+                bad = codes == -1
+            else:
+                bad = ~accepted[codes]
+        else:
+            bad = ~values.isin(allowed).to_numpy()
+        if not bad.any():
+            return []
+        # Cas rare : on distingue valeurs vides et modalites inconnues
+        missing = np.zeros(len(values), dtype=bool)
+        missing[bad] = values[bad].isna().to_numpy()
+        return [(f'{col}:modalite', bad & ~missing), (f'{col}:vide', missing)]
+
+
+DEFAULT_RULES = ValidationRules()
+
+
+def validate(df, rules=DEFAULT_RULES):
+    """Separe les lignes valides et invalides
+
+    Retourne (valides, rejetees) ; rejetees contient en plus la colonne
+    _reasons (motifs separes par ';'). Dans valides, les colonnes numeriques
+    lues comme texte (a cause d'une cellule illisible) sont deja converties ;
+    rejetees garde les valeurs brutes.
+    """
+    rules.check_columns(df)
+    bad = np.zeros(len(df), dtype=bool)
+    fired = []
+    for reason, mask in rules.masks(df):
+        if mask.any():
+            bad |= mask
+            fired.append((reason, mask))
+
+    if not fired:
+        rejected = df.iloc[:0].assign(**{REASON_COLUMN: pd.Series(dtype=object)})
+        return _numeric(df, rules), rejected
+
+    # Les motifs ne sont construits que pour les lignes rejetees
+    reasons = np.full(bad.sum(), '', dtype=object)
+    for reason, mask in fired:
+        hit = mask[bad]
+        reasons[hit] = reasons[hit] + reason + ';'
+    rejected = df[bad].assign(**{REASON_COLUMN: [r.rstrip(';') for r in reasons]})
+    return _numeric(df[~bad], rules), rejected
+
+
+def _numeric(df, rules):
+    """Convertit les colonnes numeriques restees en texte (lignes deja validees)"""
+    converted = {col: pd.to_numeric(df[col]) for col in rules.ranges
+                 if col in df.columns and not pd.api.types.is_numeric_dtype(df[col].dtype)}
+    return df.assign(**converted) if converted else df
+
+
+class QuarantineWriter:
+    """Ecrit les lignes rejetees (avec leur numero de ligne et leurs motifs) dans un CSV"""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.rows = 0
+        self._file = open(filepath, 'w', newline='')
+
+    def write(self, rejected):
+        if len(rejected):
+            rejected.rename_axis(ROW_COLUMN).reset_index().to_csv(
+                self._file, header=(self.rows == 0), index=False)
+            self._file.flush()
+            self.rows += len(rejected)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def validate_chunks(chunks, quarantine=None, rules=DEFAULT_RULES, metrics=None):
+    """Valide des blocs bruts : genere les lignes valides, ecrit les autres dans quarantine
+
+    Un bloc entierement rejete n'est pas genere (aucun bloc vide en sortie).
+    """
+    for chunk in chunks:
+        with stage(metrics, 'validation', len(chunk)):
+            valid, rejected = validate(chunk, rules)
+            if quarantine is not None:
+                quarantine.write(rejected)
+        if len(valid):
+            yield valid